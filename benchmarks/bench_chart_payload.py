@@ -0,0 +1,70 @@
+"""
+Report the spec payload each Altair chart sends to the browser, with VegaFusion off and on.
+
+Run from the project root:
+    PYTHONPATH=. python benchmarks/bench_chart_payload.py --rows 5000
+"""
+
+import argparse
+from pathlib import Path
+
+import altair as alt
+import pandas as pd
+
+from src.charts import (
+    build_academic_performance_chart,
+    build_level_gender_chart,
+    build_scatter_chart,
+    chart_memo,
+    spec_nbytes,
+)
+from src.logic import count_by, summarize_dashboard
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+
+
+def dashboard_charts(df: pd.DataFrame, max_points: int) -> dict:
+    summary = summarize_dashboard(df)
+    return {
+        "scatter": lambda: build_scatter_chart(df, max_points),
+        "academic performance": lambda: build_academic_performance_chart(summary.academic_performance),
+        "level by gender": lambda: build_level_gender_chart(summary.level_gender),
+        # The chatbot tab aggregates its query result the same way
+        "level by gender (bot)": lambda: build_level_gender_chart(count_by(df, ["Academic_Level", "Gender"])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=None, help="Rows to resample the dataset to (default: as is).")
+    parser.add_argument("--max-points", type=int, default=5000, help="Scatter binning threshold (SCATTER_MAX_POINTS).")
+    args = parser.parse_args()
+
+    df = pd.read_parquet(DATA_PATH)
+    if args.rows:
+        df = df.sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+
+    sizes = {}
+    for transformer in ("default", "vegafusion"):
+        chart_memo.clear()
+        with alt.data_transformers.enable(transformer):
+            for name, build in dashboard_charts(df, args.max_points).items():
+                try:
+                    sizes.setdefault(name, {})[transformer] = spec_nbytes(build())
+                except alt.MaxRowsError:
+                    # The client transformer refuses to inline this many rows
+                    sizes.setdefault(name, {})[transformer] = None
+
+    print(f"{len(df):,} rows, scatter binned above {args.max_points:,}")
+    print(f"{'chart':<24} {'client (B)':>12} {'vegafusion (B)':>15} {'ratio':>7}")
+    for name, by_mode in sizes.items():
+        client, server = by_mode["default"], by_mode["vegafusion"]
+        if client is None:
+            print(f"{name:<24} {'too many rows':>12} {server:>15,} {'-':>7}")
+        else:
+            print(f"{name:<24} {client:>12,} {server:>15,} {server / client:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
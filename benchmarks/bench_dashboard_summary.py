@@ -0,0 +1,73 @@
+"""
+Compare the per-renderer aggregation path with the fused dashboard summary.
+
+Run from the project root:
+    PYTHONPATH=. python benchmarks/bench_dashboard_summary.py --rows 1000000
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.logic import (
+    DashboardCube,
+    apply_dashboard_filters,
+    count_by,
+    group_platforms_for_sunburst,
+    summarize_country_metrics,
+    summarize_dashboard,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+
+
+def per_renderer(d: pd.DataFrame) -> None:
+    # What the renderers did before the summary stage: each walks the rows again
+    len(d)
+    d["Avg_Daily_Usage_Hours"].mean()
+    d["Sleep_Hours_Per_Night"].mean()
+    d["Addicted_Score"].mean()
+    count_by(d, ["Affects_Academic_Performance"])
+    count_by(d, ["Academic_Level"])
+    count_by(d, ["Academic_Level", "Gender"])
+    group_platforms_for_sunburst(d)
+    summarize_country_metrics(d)
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to resample the dataset to.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best time is reported.")
+    args = parser.parse_args()
+
+    df = pd.read_parquet(DATA_PATH).sample(args.rows, replace=True, random_state=0)
+    df = df.reset_index(drop=True)
+    rows = apply_dashboard_filters(df)
+    cube = DashboardCube(df)
+
+    results = {
+        "per-renderer (rows)": best_of(lambda: per_renderer(rows), args.repeat),
+        "fused summary (rows)": best_of(lambda: summarize_dashboard(rows), args.repeat),
+        "fused summary (cube)": best_of(lambda: summarize_dashboard(cube.query()), args.repeat),
+    }
+
+    baseline = results["per-renderer (rows)"]
+    print(f"{len(rows):,} filtered rows")
+    for name, seconds in results.items():
+        print(f"{name:<22} {seconds * 1000:9.1f} ms   {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
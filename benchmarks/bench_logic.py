@@ -0,0 +1,195 @@
+"""
+Scaling benchmarks for src/logic.py with a JSON baseline and regression check.
+
+Times the reference filter, country metrics, sunburst grouping and ISO-3
+lookup on synthetic datasets resampled from the processed data, for several
+filter mixes. Each case records its median wall time over several runs and
+its peak traced memory. A case that looks slower than the baseline is timed
+again and must be slower both times, so noise on a clean tree does not fail
+the check.
+
+Run from the project root:
+    PYTHONPATH=. python benchmarks/bench_logic.py                      # compare with the baseline
+    PYTHONPATH=. python benchmarks/bench_logic.py --update-baseline    # record a new baseline
+    PYTHONPATH=. python benchmarks/bench_logic.py --sizes 10000,100000 --threshold 0.5
+
+Exits with status 1 when any case is slower or uses more memory than the
+baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.logic import (
+    apply_dashboard_filters,
+    compact_dtypes,
+    get_iso3,
+    group_platforms_for_sunburst,
+    summarize_country_metrics,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline_logic.json"
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# Representative dashboard states, from no filtering to a narrow drill-down
+FILTER_MIXES = {
+    "none": {},
+    "gender": {"gender": "Female"},
+    "narrow": {"gender": "Male", "age_range": (19, 21), "academic_level": "Undergraduate"},
+    "countries": {"countries": ["India", "USA", "Canada", "UK", "Bangladesh"]},
+    "platforms": {"platforms": ["Instagram", "TikTok"]},
+    "clicked": {"clicked_country": "India"},
+}
+
+
+def synthetic_dataset(source: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Resample `source` with replacement to `rows` rows, in the app's compact dtypes.
+    """
+    positions = np.random.default_rng(seed).integers(0, len(source), rows)
+    return source.take(positions).reset_index(drop=True)
+
+
+def measure(fn, repeat: int) -> dict:
+    """
+    Median wall time over `repeat` runs, then peak traced memory of one more run.
+    """
+    # One untimed run first, so allocator and cache warm-up are not measured
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": float(np.median(timings)), "peak_bytes": peak}
+
+
+def run_cases(sizes: list[int], repeat: int, recheck=None) -> dict:
+    """
+    Measure every case.
+
+    A case for which `recheck(name, result)` is true is measured a second
+    time and keeps the lower of the two medians, so a slowdown is only
+    reported when two independent sets of runs both show it.
+    """
+    source = compact_dtypes(pd.read_parquet(DATA_PATH))
+    results = {}
+
+    def record(name, fn):
+        result = measure(fn, repeat)
+        if recheck is not None and recheck(name, result):
+            result["seconds"] = min(result["seconds"], measure(fn, repeat)["seconds"])
+        results[name] = result
+
+    # ISO-3 lookup does not depend on row count: prep_data resolves each
+    # distinct country once, so time it over the distinct names
+    names = sorted(source["Country"].astype(str).unique())
+    record(f"get_iso3[{len(names)} countries]", lambda: [get_iso3(name) for name in names])
+
+    for rows in sizes:
+        df = synthetic_dataset(source, rows)
+        for mix, filters in FILTER_MIXES.items():
+            record(f"apply_dashboard_filters[{mix}]@{rows}", lambda: apply_dashboard_filters(df, **filters))
+        for mix in ("none", "narrow"):
+            filtered = apply_dashboard_filters(df, **FILTER_MIXES[mix])
+            record(f"summarize_country_metrics[{mix}]@{rows}", lambda: summarize_country_metrics(filtered))
+            record(f"group_platforms_for_sunburst[{mix}]@{rows}", lambda: group_platforms_for_sunburst(filtered))
+        del df, filtered
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, memory_threshold: float, floor_seconds: float) -> list[str]:
+    """
+    Describe every case that regressed past its threshold.
+
+    Cases missing from the baseline are skipped. Time differences below
+    `floor_seconds` are treated as noise.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        slower = current["seconds"] - previous["seconds"]
+        if slower > floor_seconds and current["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append(
+                f"{name}: {previous['seconds'] * 1000:.1f} ms -> {current['seconds'] * 1000:.1f} ms"
+            )
+        if current["peak_bytes"] > previous["peak_bytes"] * (1 + memory_threshold):
+            regressions.append(
+                f"{name}: peak {previous['peak_bytes'] / 2**20:.1f} MiB -> {current['peak_bytes'] / 2**20:.1f} MiB"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=DEFAULT_SIZES,
+        help="Comma-separated dataset sizes in rows.",
+    )
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case; the median time is kept.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON file.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown as a fraction (0.25 = 25%%).")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="Allowed peak-memory growth as a fraction.")
+    parser.add_argument("--floor-ms", type=float, default=10.0, help="Ignore slowdowns smaller than this many ms.")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.update_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    def regressed(name, result):
+        return bool(compare({name: result}, baseline, args.threshold, args.memory_threshold, args.floor_ms / 1000))
+
+    results = run_cases(args.sizes, args.repeat, regressed if baseline else None)
+    for name, result in results.items():
+        print(f"{name:<50} {result['seconds'] * 1000:10.2f} ms {result['peak_bytes'] / 2**20:10.1f} MiB")
+
+    if args.update_baseline:
+        report = {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline first.")
+        return
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold, args.floor_ms / 1000)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline.name}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against {args.baseline.name}.")
+
+
+if __name__ == "__main__":
+    main()
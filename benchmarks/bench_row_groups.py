@@ -0,0 +1,134 @@
+"""
+Row-group skipping report for parquet layouts written by prep_data.py.
+
+Rewrites one student table with each layout (sort keys, row-group size,
+compression, dictionary encoding) and reports, for the dashboard filter
+mixes of bench_logic.py, how many row groups their min/max statistics let a
+pushdown query skip, plus file size and pushdown query time.
+
+Run from the project root:
+    PYTHONPATH=. python benchmarks/bench_row_groups.py                     # 2M synthetic rows
+    PYTHONPATH=. python benchmarks/bench_row_groups.py --sort-by Student_ID --sort-by Academic_Level,Gender,Age
+    PYTHONPATH=. python benchmarks/bench_row_groups.py --source data/synthetic/<file>.parquet --compression zstd
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+import ibis
+import pandas as pd
+
+from benchmarks.bench_logic import FILTER_MIXES
+from src.dataset import PARQUET_COMPRESSIONS, ParquetLayout, row_groups_to_read, students_table
+from src.logic import apply_dashboard_filters
+from src.synthetic import fit_synthetic_model, write_synthetic_parquet
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+
+DEFAULT_SORTS = [("Student_ID",), ("Country", "Academic_Level", "Age")]
+
+
+def write_layout(source: Path, out: Path, layout: ParquetLayout) -> float:
+    """
+    Rewrite `source` to `out` with `layout`; returns the seconds taken.
+    """
+    start = time.perf_counter()
+    duckdb.connect().execute(f"""
+        COPY (SELECT * FROM read_parquet('{source}') {layout.order_by()})
+        TO '{out}' (FORMAT PARQUET, {layout.copy_options()})
+    """)
+    return time.perf_counter() - start
+
+
+def time_pushdown(path: Path, filters: dict, repeat: int) -> float:
+    """
+    Best time of a filtered pushdown aggregate, like the dashboard tiles.
+    """
+    table = students_table(ibis.duckdb.connect(), path)
+    filtered = apply_dashboard_filters(table, **filters)
+    query = filtered.aggregate(students=filtered.count(), addiction=filtered.Addicted_Score.mean())
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query.execute()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report_layout(source: Path, workdir: Path, layout: ParquetLayout, repeat: int) -> dict:
+    out = workdir / f"{'-'.join(layout.sort_by) or 'unsorted'}.parquet"
+    write_seconds = write_layout(source, out, layout)
+    mixes = {}
+    for mix, filters in FILTER_MIXES.items():
+        groups_read, groups, rows_read, rows = row_groups_to_read(out, **filters)
+        mixes[mix] = {
+            "row_groups_read": groups_read,
+            "row_groups": groups,
+            "rows_read_fraction": rows_read / rows if rows else 0.0,
+            "query_seconds": time_pushdown(out, filters, repeat),
+        }
+    return {
+        "layout": layout.to_dict(),
+        "file_bytes": out.stat().st_size,
+        "write_seconds": write_seconds,
+        "filters": mixes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=None, help="Parquet file to lay out (default: synthetic rows).")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic rows to generate when no --source is given.")
+    parser.add_argument(
+        "--sort-by",
+        action="append",
+        type=lambda s: tuple(c for c in s.split(",") if c),
+        default=None,
+        help="Comma-separated sort keys of one layout; repeat to compare layouts.",
+    )
+    parser.add_argument("--row-group-size", type=int, default=ParquetLayout.row_group_size, help="Rows per row group.")
+    parser.add_argument("--compression", choices=PARQUET_COMPRESSIONS, default=ParquetLayout.compression)
+    parser.add_argument("--no-dictionary", action="store_true", help="Disable dictionary encoding.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per pushdown query; the best time is kept.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report to this file.")
+    args = parser.parse_args()
+
+    layouts = [
+        ParquetLayout(sort_by, args.row_group_size, args.compression, not args.no_dictionary)
+        for sort_by in (args.sort_by or DEFAULT_SORTS)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        source = args.source
+        if source is None:
+            source = workdir / "source.parquet"
+            write_synthetic_parquet(fit_synthetic_model(pd.read_parquet(DATA_PATH)), source, args.rows)
+        reports = [report_layout(source, workdir, layout, args.repeat) for layout in layouts]
+
+    for report in reports:
+        layout = report["layout"]
+        print(
+            f"\nsort by {','.join(layout['sort_by']) or '(input order)'}, {layout['row_group_size']:,} rows/group, "
+            f"{layout['compression']}, dictionary {'on' if layout['dictionary'] else 'off'}: "
+            f"{report['file_bytes'] / 2**20:.1f} MiB, written in {report['write_seconds']:.1f}s"
+        )
+        print(f"  {'filter':<12} {'row groups read':>16} {'rows read':>10} {'query ms':>9}")
+        for mix, result in report["filters"].items():
+            groups = f"{result['row_groups_read']}/{result['row_groups']}"
+            print(
+                f"  {mix:<12} {groups:>16} {result['rows_read_fraction']:>10.1%} "
+                f"{result['query_seconds'] * 1000:>9.1f}"
+            )
+
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
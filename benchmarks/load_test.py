@@ -0,0 +1,432 @@
+"""
+Concurrent-session load test for the Shiny app, fully offline.
+
+Starts src/app.py in a worker process with QueryChat pointed at a local stub
+LLM, opens N simultaneous websocket sessions that replay filter, map-click
+and chatbot sequences, and reports p50/p95/p99 time-to-update per output plus
+the worker's CPU and RSS.
+
+Run from the project root:
+    PYTHONPATH=. python benchmarks/load_test.py --sessions 20 --rounds 3
+    DASHBOARD_PUSHDOWN=1 PYTHONPATH=. python benchmarks/load_test.py --sessions 50 --json out.json
+
+DASHBOARD_* variables in the environment are passed through to the worker.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import uvicorn
+import websockets
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+ROOT = Path(__file__).resolve().parents[1]
+
+OUTPUTS = [
+    "tile_students", "tile_usage", "tile_sleep", "tile_addiction",
+    "selected_country_text", "scatter_chart", "map_chart", "plot_AAP",
+    "donut_academic_level", "plot_academiclvldist", "sunburst_platform",
+    "chatbot_panel", "chat_df", "plot_AAP_bot", "plot_academiclvldist_bot", "scatter_chart_bot",
+]
+
+INITIAL_INPUTS = {
+    "f_gender": "All",
+    "f_age": [16, 24],
+    "f_level": "All",
+    "f_country": None,
+    "f_platform": None,
+    "clear_map_country": 0,
+    "reset": 0,
+    "tabs": "Dashboard",
+}
+
+# Queries the stub LLM answers with, as QueryChat's update-dashboard tool call
+STUB_QUERIES = [
+    ("SELECT * FROM df WHERE \"Gender\" = 'Female'", "Female students"),
+    ("SELECT * FROM df WHERE \"Addicted_Score\" >= 8", "Highly addicted students"),
+    ("SELECT * FROM df WHERE \"Most_Used_Platform\" = 'TikTok'", "TikTok users"),
+    ("SELECT * FROM df WHERE \"Sleep_Hours_Per_Night\" < 6", "Short sleepers"),
+]
+
+# Each step is ("inputs", {...}), ("click", point_index), ("clear_click", None)
+# or ("chat", prompt). Steps run in order with think time in between.
+SCENARIOS = {
+    "explore": [
+        ("inputs", {"f_gender": "Female"}),
+        ("inputs", {"f_level": "Undergraduate"}),
+        ("inputs", {"f_age": [18, 21]}),
+        ("inputs", {"f_gender": "All", "f_level": "All", "f_age": [16, 24]}),
+    ],
+    "countries": [
+        ("inputs", {"f_country": ["India", "USA", "Canada"]}),
+        ("inputs", {"f_platform": ["Instagram"]}),
+        ("inputs", {"f_country": None, "f_platform": None}),
+    ],
+    "map": [
+        # Clicks happen with no country filter, so the data layer has ~100 points
+        ("click", 3),
+        ("inputs", {"f_gender": "Male"}),
+        ("clear_click", None),
+        ("click", 11),
+        ("clear_click", None),
+        ("inputs", {"f_gender": "All"}),
+    ],
+    "chat": [
+        # The chatbot tab (and QueryChat) is built when it is first opened
+        ("inputs", {"tabs": "Chatbot"}),
+        ("chat", "Show me a subset of students"),
+        ("chat", "Now a different subset"),
+    ],
+}
+
+
+# ── Stub LLM ──────────────────────────────────────────────────────────
+def _sse(chunk: dict) -> str:
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def _completion_chunk(delta: dict, finish_reason=None) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "stub",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def stub_llm_app(latency: float) -> Starlette:
+    """
+    An OpenAI-compatible chat-completions endpoint with canned replies.
+
+    A user message is answered with a QueryChat update-dashboard tool call
+    (cycling through `STUB_QUERIES`); a tool result is answered with a short
+    text reply. `latency` seconds are slept before replying to mimic a model.
+    """
+    calls = {"n": 0}
+
+    async def completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        last = body["messages"][-1]
+        tools = [t["function"]["name"] for t in body.get("tools", [])]
+        update_tool = next((name for name in tools if "update_dashboard" in name), None)
+
+        if last["role"] == "user" and update_tool:
+            query, title = STUB_QUERIES[calls["n"] % len(STUB_QUERIES)]
+            calls["n"] += 1
+            arguments = json.dumps({"table": "df", "query": query, "title": title})
+            delta = {
+                "role": "assistant",
+                "tool_calls": [{
+                    "index": 0,
+                    "id": f"call_{calls['n']}",
+                    "type": "function",
+                    "function": {"name": update_tool, "arguments": arguments},
+                }],
+            }
+            chunks = [_completion_chunk(delta), _completion_chunk({}, "tool_calls")]
+        else:
+            chunks = [
+                _completion_chunk({"role": "assistant", "content": "Done, the dashboard is updated."}),
+                _completion_chunk({}, "stop"),
+            ]
+
+        if not body.get("stream"):
+            message = {"role": "assistant", **{k: v for k, v in chunks[0]["choices"][0]["delta"].items() if k != "role"}}
+            return JSONResponse({
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": "stub",
+                "choices": [{"index": 0, "message": message, "finish_reason": chunks[-1]["choices"][0]["finish_reason"]}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+        async def stream():
+            for chunk in chunks:
+                yield _sse(chunk)
+            yield _sse({**_completion_chunk({}), "choices": [], "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return Starlette(routes=[Route("/v1/chat/completions", completions, methods=["POST"])])
+
+
+def serve_in_thread(app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ── Worker process ────────────────────────────────────────────────────
+def start_worker(port: int, llm_port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(ROOT),
+        "QUERYCHAT_CLIENT": "openai-completions/stub",
+        "CHATLAS_CHAT_ARGS": json.dumps({"base_url": f"http://127.0.0.1:{llm_port}/v1", "api_key": "stub"}),
+    })
+    worker = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if worker.poll() is not None:
+            raise RuntimeError(f"App worker exited during startup:\n{worker.stderr.read().decode()[-2000:]}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return worker
+        except OSError:
+            time.sleep(0.25)
+    worker.kill()
+    raise RuntimeError("App worker did not start within 120 s.")
+
+
+class ProcessSampler:
+    """
+    Samples a process's CPU time and RSS from /proc (Linux) in the background.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[tuple[float, float, int]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _read(self) -> tuple[float, int]:
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        with open(f"/proc/{self.pid}/status") as f:
+            rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        return cpu_seconds, rss_kb * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                cpu, rss = self._read()
+            except (OSError, StopIteration):
+                return
+            self.samples.append((time.monotonic(), cpu, rss))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if os.path.exists(f"/proc/{self.pid}/stat"):
+            self._thread.start()
+        return self
+
+    def stop(self) -> dict:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if len(self.samples) < 2:
+            return {}
+        (t0, cpu0, rss0), (t1, cpu1, _) = self.samples[0], self.samples[-1]
+        return {
+            "cpu_percent_avg": 100 * (cpu1 - cpu0) / (t1 - t0),
+            "rss_start_mib": rss0 / 2**20,
+            "rss_peak_mib": max(rss for _, _, rss in self.samples) / 2**20,
+            "rss_end_mib": self.samples[-1][2] / 2**20,
+        }
+
+
+# ── Simulated sessions ────────────────────────────────────────────────
+class Session:
+    """
+    One simulated browser session speaking Shiny's websocket protocol.
+    """
+
+    def __init__(self, url: str, index: int, quiet: float, timeout: float):
+        self.url = url
+        self.index = index
+        self.quiet = quiet
+        self.timeout = timeout
+        self.widget_outputs: dict[str, str] = {}
+        self.chat_count = 0
+        self.ws = None
+
+    async def _step(self, data: dict, await_reply: bool = False) -> dict[str, float]:
+        """
+        Send an input update and wait for the app to settle.
+
+        With `await_reply`, the step also waits for the chatbot to finish its
+        streamed reply, which arrives after the session first goes idle.
+        Returns the seconds from sending until each output's last update; the
+        end of the reply is recorded as output "chat_reply".
+        """
+        start = time.perf_counter()
+        await self.ws.send(json.dumps({"method": "update" if self.ws_ready else "init", "data": data}))
+        self.ws_ready = True
+        updated: dict[str, float] = {}
+        replied = not await_reply
+        wait = self.timeout
+        while True:
+            try:
+                raw = await asyncio.wait_for(self.ws.recv(), wait)
+            except asyncio.TimeoutError:
+                return updated
+            now = time.perf_counter() - start
+            message = json.loads(raw)
+            for name, value in (message.get("values") or {}).items():
+                updated[name] = now
+                if isinstance(value, dict) and "model_id" in value:
+                    self.widget_outputs[value["model_id"]] = name
+            for kind, payload in (message.get("custom") or {}).items():
+                if kind == "shinyChatMessage" and payload.get("action", {}).get("type") == "chunk_end":
+                    updated["chat_reply"] = now
+                    replied = True
+                elif isinstance(payload, str) and '"ident": "comm-' in payload:
+                    comm_id = payload.rsplit('"ident": "comm-', 1)[1].split('"', 1)[0]
+                    if comm_id in self.widget_outputs:
+                        updated[self.widget_outputs[comm_id]] = now
+            if message.get("busy") == "idle" and replied:
+                # Widget messages can trail the idle signal slightly
+                wait = self.quiet
+            elif message.get("busy") == "busy":
+                wait = self.timeout
+
+    async def run(self, steps: list, rounds: int, think: float, results: dict) -> None:
+        self.ws_ready = False
+        async with websockets.connect(self.url, max_size=None) as ws:
+            self.ws = ws
+            init = dict(INITIAL_INPUTS)
+            init.update({f".clientdata_output_{name}_hidden": False for name in OUTPUTS})
+            self._record(results, "init", await self._step(init))
+
+            for _ in range(rounds):
+                for kind, arg in steps:
+                    await asyncio.sleep(think)
+                    updated = await self._step(self._inputs_for(kind, arg), await_reply=kind == "chat")
+                    self._record(results, kind, updated)
+
+    def _inputs_for(self, kind: str, arg) -> dict:
+        if kind == "inputs":
+            return arg
+        if kind == "click":
+            map_id = next(mid for mid, name in self.widget_outputs.items() if name == "map_chart")
+            callback = {
+                "event_type": "plotly_click",
+                "points": {"trace_indexes": [1], "point_indexes": [arg], "xs": [None], "ys": [None]},
+            }
+            message = {
+                "content": {"comm_id": map_id, "data": {"method": "update", "state": {"_js2py_pointsCallback": callback}, "buffer_paths": []}},
+                "buffers": [],
+            }
+            return {"shinywidgets_comm_send": json.dumps(message)}
+        if kind == "clear_click":
+            self.clicks_cleared = getattr(self, "clicks_cleared", 0) + 1
+            return {"clear_map_country:shiny.action": self.clicks_cleared}
+        if kind == "chat":
+            self.chat_count += 1
+            # Unique text so every submission is a new input value
+            return {"querychat_df-chat_user_input": {"text": f"{arg} (#{self.chat_count})", "attachments": []}}
+        raise ValueError(f"Unknown step kind {kind!r}")
+
+    @staticmethod
+    def _record(results: dict, step: str, updated: dict[str, float]) -> None:
+        for name, seconds in updated.items():
+            results["outputs"].setdefault(name, []).append(seconds)
+        results["steps"].setdefault(step, []).append(max(updated.values(), default=0.0))
+
+
+def percentiles(values: list[float]) -> dict:
+    ms = np.asarray(values) * 1000
+    return {
+        "n": len(values),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+async def run_sessions(url: str, sessions: int, rounds: int, think: float, quiet: float, timeout: float) -> dict:
+    results = {"outputs": {}, "steps": {}}
+    names = list(SCENARIOS)
+    tasks = [
+        Session(url, i, quiet, timeout).run(SCENARIOS[names[i % len(names)]], rounds, think, results)
+        for i in range(sessions)
+    ]
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    results["errors"] = [repr(o) for o in outcomes if isinstance(o, Exception)]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions.")
+    parser.add_argument("--rounds", type=int, default=2, help="Times each session replays its scenario.")
+    parser.add_argument("--think", type=float, default=1.0, help="Seconds between a session's steps.")
+    parser.add_argument(
+        "--quiet", type=float, default=0.5,
+        help="Seconds of silence after idle that end a step; keep above DASHBOARD_DEBOUNCE_MS.",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Longest wait for a step's first message.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the stub LLM waits before replying.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the report to this file.")
+    args = parser.parse_args()
+
+    llm_port, app_port = free_port(), free_port()
+    llm = serve_in_thread(stub_llm_app(args.llm_latency), llm_port)
+    worker = start_worker(app_port, llm_port)
+    sampler = ProcessSampler(worker.pid).start()
+    try:
+        start = time.perf_counter()
+        results = asyncio.run(run_sessions(
+            f"ws://127.0.0.1:{app_port}/websocket/", args.sessions, args.rounds, args.think, args.quiet, args.timeout
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        process = sampler.stop()
+        worker.terminate()
+        worker.wait(timeout=30)
+        llm.should_exit = True
+
+    report = {
+        "sessions": args.sessions,
+        "rounds": args.rounds,
+        "elapsed_s": elapsed,
+        "worker": process,
+        "outputs": {name: percentiles(v) for name, v in sorted(results["outputs"].items())},
+        "steps": {name: percentiles(v) for name, v in sorted(results["steps"].items())},
+        "errors": results["errors"],
+    }
+
+    print(f"{args.sessions} sessions x {args.rounds} rounds in {elapsed:.1f}s")
+    for section in ("steps", "outputs"):
+        print(f"\n{'time-to-update (' + section + ')':<34} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, p in report[section].items():
+            print(f"{name:<34} {p['n']:>5} {p['p50_ms']:>9.0f} {p['p95_ms']:>9.0f} {p['p99_ms']:>9.0f}")
+    if process:
+        print(
+            f"\nworker CPU {process['cpu_percent_avg']:.0f}% avg, RSS {process['rss_start_mib']:.0f} MiB at start, "
+            f"{process['rss_peak_mib']:.0f} MiB peak, {process['rss_end_mib']:.0f} MiB at end"
+        )
+    if report["errors"]:
+        print(f"\n{len(report['errors'])} session(s) failed: {report['errors'][:3]}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
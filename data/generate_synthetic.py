@@ -0,0 +1,45 @@
+"""
+Generate a synthetic student table with the distributions of the real one.
+
+Run from the project root:
+    python data/generate_synthetic.py --rows 10000000 --seed 0
+
+The output has the same schema as the processed Parquet file, so the app can
+load it in place of the real data. Rows are written one chunk at a time.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent        # data/
+ROOT = HERE.parent                            # project root
+sys.path.insert(0, str(ROOT))
+
+from src.synthetic import DEFAULT_CHUNK_ROWS, fit_synthetic_model, write_synthetic_parquet  # noqa: E402
+
+PARQUET_PATH = HERE / "processed" / "Students-Social-Media-Addiction.parquet"
+SYNTHETIC_DIR = HERE / "synthetic"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, required=True, help="Number of students to generate.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same file.")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows generated and written at a time.")
+    parser.add_argument("--out", type=Path, default=None, help="Output path (default: data/synthetic/...).")
+    args = parser.parse_args()
+
+    out = args.out or SYNTHETIC_DIR / f"Students-Social-Media-Addiction-{args.rows}-seed{args.seed}.parquet"
+
+    start = time.perf_counter()
+    model = fit_synthetic_model(pd.read_parquet(PARQUET_PATH))
+    write_synthetic_parquet(model, out, args.rows, seed=args.seed, chunk_rows=args.chunk_rows)
+    print(f"Wrote {args.rows:,} rows to {out} in {time.perf_counter() - start:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,202 @@
+"""
+Build the processed student data from raw survey CSVs.
+
+Run from the project root:
+    python data/prep_data.py                                    # rebuild data/processed/Students-Social-Media-Addiction.parquet if the raw CSV changed
+    python data/prep_data.py --append new_batch.csv             # add a batch to data/processed/students/
+    python data/prep_data.py --append new_batch.csv --batch-date 2026-10-18
+    python data/prep_data.py --sort-by Country,Academic_Level,Age --row-group-size 100000 --compression zstd
+
+The processed file is only rebuilt when the raw CSV's hash or the layout
+differs from what its metadata sidecar records (or with --force).
+
+Append mode writes each batch as new files in a dataset partitioned by
+Country and batch date (data/processed/students/Country=<name>/batch_date=<date>/)
+and never rewrites existing files. A CSV that was already ingested is
+skipped. Serve the dataset with DASHBOARD_DATA=data/processed/students.
+
+The layout options (sort keys, row-group size, compression, dictionary
+encoding) apply to both modes. Sorting by the filtered columns gives row
+groups narrow min/max statistics that pushdown queries can skip on; compare
+layouts with benchmarks/bench_row_groups.py.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import sys
+from pathlib import Path
+
 import duckdb
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent        # data/
+ROOT = HERE.parent                            # project root
+sys.path.insert(0, str(ROOT))
+
+from src.dataset import PARQUET_COMPRESSIONS, PARTITION_COLUMNS, ParquetLayout  # noqa: E402
+from src.download_data import file_sha256  # noqa: E402
+from src.logic import get_iso3  # noqa: E402
+from src.metadata import dataset_metadata, merge_metadata, read_metadata, save_metadata, write_metadata  # noqa: E402
+
+RAW_PATH = HERE / "raw" / "Students-Social-Media-Addiction.csv"
+PARQUET_PATH = HERE / "processed" / "Students-Social-Media-Addiction.parquet"
+DATASET_PATH = HERE / "processed" / "students"
+
+
+def register_iso_lookup(con, csv_path: Path) -> list[str]:
+    """
+    Register an `iso_lookup` view of the CSV's countries and their ISO-3 codes.
+
+    Each distinct country is resolved once, so the map never does fuzzy
+    name matching at request time. Returns the countries left unresolved.
+    """
+    countries = con.execute(
+        f"SELECT DISTINCT Country FROM read_csv_auto('{csv_path}') ORDER BY Country"
+    ).df()["Country"]
+    iso_lookup = pd.DataFrame({"Country": countries, "iso_alpha": countries.map(get_iso3)})
+    con.register("iso_lookup", iso_lookup)
+    return iso_lookup.loc[iso_lookup["iso_alpha"].isna(), "Country"].tolist()
+
+
+def processed_query(csv_path: Path, layout: ParquetLayout) -> str:
+    """
+    SQL turning the raw CSV into the processed table (needs `iso_lookup`),
+    ordered by the layout's sort keys.
+    """
+    return f"""
+        SELECT
+            s.* EXCLUDE ("Affects_Academic_Performance"),
+            CASE WHEN s."Affects_Academic_Performance" = true THEN 'Yes' ELSE 'No' END AS "Affects_Academic_Performance",
+            i.iso_alpha
+        FROM read_csv_auto('{csv_path}') AS s
+        LEFT JOIN iso_lookup AS i USING ("Country")
+        {layout.order_by()}
+    """
+
+
+def report_countries(con, unresolved: list[str]) -> None:
+    total = con.execute("SELECT count(*) FROM iso_lookup").fetchone()[0]
+    print(f"Resolved {total - len(unresolved)}/{total} countries to ISO-3.")
+    if unresolved:
+        print(f"Unresolved (no map shape): {', '.join(unresolved)}")
+
+
+def rebuild(
+    csv_path: Path = RAW_PATH,
+    parquet_path: Path = PARQUET_PATH,
+    layout: ParquetLayout = ParquetLayout(),
+    force: bool = False,
+) -> bool:
+    """
+    Rewrite the single processed parquet file from one CSV.
 
-duckdb.execute(f"""
-    COPY (
-        SELECT 
-            * EXCLUDE ("Affects_Academic_Performance"),
-            CASE WHEN "Affects_Academic_Performance" = true THEN 'Yes' ELSE 'No' END AS "Affects_Academic_Performance"
-        FROM read_csv_auto('raw/Students-Social-Media-Addiction.csv')
+    Skipped when the file's metadata sidecar is current and records the same
+    CSV hash and layout. Returns whether the file was rebuilt.
+    """
+    provenance = {"raw_sha256": file_sha256(csv_path), "layout": layout.to_dict()}
+    current = read_metadata(parquet_path) if parquet_path.exists() else None
+    if not force and current is not None and current.get("provenance") == provenance:
+        print(f"{parquet_path.name} is up to date with {csv_path.name}; nothing to do (use --force to rebuild).")
+        return False
+
+    con = duckdb.connect()
+    unresolved = register_iso_lookup(con, csv_path)
+    unresolved_report = json.dumps(unresolved).replace("'", "''")
+
+    con.execute(f"""
+        COPY ({processed_query(csv_path, layout)})
+        TO '{parquet_path}' (
+            FORMAT PARQUET,
+            {layout.copy_options()},
+            KV_METADATA {{unresolved_countries: '{unresolved_report}'}}
+        )
+    """)
+
+    # Ranges, distinct values and a content hash the app reads at startup
+    # instead of scanning the table
+    metadata_path = write_metadata(parquet_path, provenance=provenance)
+
+    report_countries(con, unresolved)
+    print(f"Wrote {metadata_path.name}.")
+    return True
+
+
+def append_batch(
+    csv_path: Path,
+    dataset_path: Path = DATASET_PATH,
+    batch_date: datetime.date | None = None,
+    layout: ParquetLayout = ParquetLayout(),
+) -> None:
+    """
+    Append one CSV batch to the partitioned dataset as new files.
+
+    Files are named after a hash of the CSV, so ingesting the same batch
+    twice is detected and skipped. The dataset's metadata sidecar is
+    updated from the batch alone when it is current, otherwise rebuilt.
+    """
+    batch_date = batch_date or datetime.date.today()
+    batch_id = hashlib.blake2b(csv_path.read_bytes(), digest_size=8).hexdigest()
+    if dataset_path.exists() and next(dataset_path.rglob(f"batch-{batch_id}-*.parquet"), None):
+        print(f"{csv_path.name} is already in {dataset_path.name}/ (batch {batch_id}); nothing to do.")
+        return
+
+    # Read before writing: the sidecar only matches the dataset as it is now
+    previous = read_metadata(dataset_path) if dataset_path.exists() else None
+
+    dataset_path.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+    unresolved = register_iso_lookup(con, csv_path)
+    batch = con.execute(processed_query(csv_path, layout)).df()
+    con.register("batch", batch)
+    con.execute(f"""
+        COPY (SELECT *, DATE '{batch_date.isoformat()}' AS batch_date FROM batch)
+        TO '{dataset_path}' (
+            FORMAT PARQUET,
+            PARTITION_BY ({", ".join(PARTITION_COLUMNS)}),
+            {layout.copy_options()},
+            APPEND,
+            FILENAME_PATTERN 'batch-{batch_id}-{{uuid}}'
+        )
+    """)
+
+    if previous is None:
+        metadata_path = write_metadata(dataset_path)
+    else:
+        metadata_path = save_metadata(dataset_path, merge_metadata(previous, dataset_metadata(batch)))
+
+    report_countries(con, unresolved)
+    print(
+        f"Appended {len(batch):,} rows in {batch['Country'].nunique()} country partitions "
+        f"to {dataset_path.name}/ (batch {batch_id}, {batch_date}); wrote {metadata_path.name}."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--append", type=Path, default=None, metavar="CSV", help="Append this CSV batch to the partitioned dataset.")
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH, help="Partitioned dataset directory for --append.")
+    parser.add_argument("--batch-date", type=datetime.date.fromisoformat, default=None, help="Batch date partition (default: today).")
+    defaults = ParquetLayout()
+    parser.add_argument(
+        "--sort-by",
+        type=lambda s: tuple(c for c in s.split(",") if c),
+        default=defaults.sort_by,
+        help="Comma-separated sort keys, e.g. Country,Academic_Level,Age (default: Student_ID).",
     )
-    TO 'processed/Students-Social-Media-Addiction.parquet' (FORMAT PARQUET)
-""")
\ No newline at end of file
+    parser.add_argument("--row-group-size", type=int, default=defaults.row_group_size, help="Rows per row group.")
+    parser.add_argument("--compression", choices=PARQUET_COMPRESSIONS, default=defaults.compression, help="Parquet compression codec.")
+    parser.add_argument("--no-dictionary", action="store_true", help="Disable dictionary encoding.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the raw CSV and layout are unchanged.")
+    args = parser.parse_args()
+
+    layout = ParquetLayout(args.sort_by, args.row_group_size, args.compression, not args.no_dictionary)
+    if args.append is None:
+        rebuild(layout=layout, force=args.force)
+    else:
+        append_batch(args.append, args.dataset, args.batch_date, layout)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,57 @@ Open:     http://127.0.0.1:8000
 
 # ── IMPORTS ───────────────────────────────────────────────────────────
 
-from .logic import apply_dashboard_filters, summarize_country_metrics, group_platforms_for_sunburst, get_iso3
+from .logic import (
+    DashboardCube,
+    DashboardFilterIndex,
+    IncrementalFilter,
+    apply_dashboard_filters,
+    compact_dtypes,
+    frame_nbytes,
+    summarize_dashboard,
+    select_columns,
+    bin_scatter,
+)
+from .cache import LRUCache, normalize_filters
+from .debounce import debounced
+from .dataset import dataset_columns, read_students, students_table
+from .metadata import dataset_metadata, read_metadata
+from .export import EXPORT_EXTENSIONS, EXPORT_FORMATS, iter_export
+from .metrics import (
+    MetricsRegistry,
+    instrument,
+    instrument_chat_client,
+    instrument_session,
+    metrics_route,
+)
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import plotly.express as px
-import pycountry
-import altair as alt
-import ibis
-from shiny import App, render, ui, reactive
+from shiny import App, render, ui, reactive, req
 from shinywidgets import render_plotly, render_altair, output_widget
 from pathlib import Path
-from querychat import QueryChat
 from dotenv import load_dotenv
-import plotly.graph_objects as go
+
+# altair, plotly, pycountry, ibis and querychat are imported where they are
+# first needed, so a worker starts serving before paying for them.
+# tests/test_app_startup.py keeps the import-time budget.
 
 # ── DATA ─────────────────────────────────────────────────────────────
 
+# Before the options below are read, so they can be set in .env
+load_dotenv()
+
 # Build a robust path (works locally + on Connect Cloud)
 HERE = Path(__file__).resolve().parent        # src/
 ROOT = HERE.parent                            # project root
-DATA_PATH = ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+# DASHBOARD_DATA serves another parquet file or a partitioned dataset directory
+# built by `prep_data.py --append` (e.g. data/processed/students)
+DATA_PATH = ROOT / os.getenv("DASHBOARD_DATA", "data/processed/Students-Social-Media-Addiction.parquet")
 
 if not DATA_PATH.exists():
     raise FileNotFoundError(
@@ -33,36 +65,363 @@ if not DATA_PATH.exists():
         "Run prep_data.py first to convert the CSV to parquet."
     )
 
-# ── ibis + DuckDB connection (lazy — no data loaded yet) ─────────────
-con = ibis.duckdb.connect()
-students = con.read_parquet(str(DATA_PATH))
-
-# ── One-time helper queries for filter components ────────────────────
-_meta = students.aggregate(
-    age_min=students.Age.min(),
-    age_max=students.Age.max(),
-    score_min=students.Addicted_Score.min(),
-    score_max=students.Addicted_Score.max(),
-).execute().iloc[0]
-
-AGE_MIN   = int(_meta["age_min"])
-AGE_MAX   = int(_meta["age_max"])
-MIN_SCORE = float(_meta["score_min"])
-MAX_SCORE = float(_meta["score_max"])
-
-_countries = sorted(
-    students.select(students.Country).distinct().execute()["Country"].tolist()
+if "iso_alpha" not in dataset_columns(DATA_PATH):
+    raise ValueError(
+        f"{DATA_PATH.name} has no iso_alpha column. "
+        "Re-run prep_data.py to rebuild the parquet with precomputed ISO-3 codes."
+    )
+
+# Pushdown mode: dashboard filters and aggregations run inside DuckDB and only
+# small aggregate frames come back to Python. Enable with DASHBOARD_PUSHDOWN=1.
+PUSHDOWN = os.getenv("DASHBOARD_PUSHDOWN", "0").lower() in ("1", "true", "yes")
+
+# ── ibis + DuckDB connection (pushdown mode only — no data loaded yet) ──
+if PUSHDOWN:
+    import ibis
+
+    # A partitioned dataset is read with hive partitioning, so country filters
+    # and map clicks only scan the matching Country=<name> files
+    students = students_table(ibis.duckdb.connect(), DATA_PATH)
+
+
+@functools.cache
+def world_iso3():
+    # Every ISO-3 code, drawn grey underneath the map's data layer
+    import pycountry
+
+    return [c.alpha_3 for c in pycountry.countries]
+
+
+NO_DATA_ANNOTATION = dict(
+    text="No data available", x=0.5, y=0.5, xref="paper", yref="paper",
+    showarrow=False, font=dict(size=20, color="gray"),
+)
+
+# Above this many rows the scatter plots switch to server-side 2D bins
+SCATTER_MAX_POINTS = int(os.getenv("SCATTER_MAX_POINTS", "5000"))
+
+# VegaFusion mode: Altair charts run their Vega transforms in this process and
+# the browser receives transformed data. Enable with DASHBOARD_VEGAFUSION=1.
+# On these charts the payloads grow rather than shrink (see charts.use_vegafusion).
+VEGAFUSION = os.getenv("DASHBOARD_VEGAFUSION", "0").lower() in ("1", "true", "yes")
+
+
+@functools.cache
+def charts():
+    """
+    The chart builders in src/charts.py, imported (with altair) on first use.
+    """
+    from . import charts as builders
+
+    builders.use_vegafusion(VEGAFUSION)
+    return builders
+
+
+# Render metrics: latency histograms, invocation counts and payload bytes per
+# calc and output, served at /metrics. Disable with DASHBOARD_METRICS=0.
+METRICS = os.getenv("DASHBOARD_METRICS", "1").lower() in ("1", "true", "yes")
+render_metrics = MetricsRegistry()
+instrumented = instrument(render_metrics) if METRICS else (lambda target: target)
+
+# Sidebar filter changes are coalesced until the inputs have been quiet this
+# long, so dragging a slider or ticking several boxes recomputes once.
+# DASHBOARD_DEBOUNCE_MS=0 recomputes on every change.
+FILTER_DEBOUNCE_SECONDS = float(os.getenv("DASHBOARD_DEBOUNCE_MS", "250")) / 1000
+
+# The one resident copy of the data, with categorical labels and downcast
+# numbers, indexed by row position. The dashboard and QueryChat share it:
+# QueryChat's DuckDB table is a view over this frame that casts to int64 and
+# plain strings as it is queried (see querychat()), and downloads are widened
+# chunk by chunk (see iter_export). Pushdown mode keeps the rows in DuckDB and
+# loads none of them here.
+if PUSHDOWN:
+    students_df = None
+else:
+    _raw = read_students(DATA_PATH)
+    _raw_nbytes = frame_nbytes(_raw)
+    students_df = compact_dtypes(_raw)
+    del _raw
+
+# ── One-time helper values for filter components ─────────────────────
+# Read from the sidecar prep_data.py writes; the data is only scanned when the
+# sidecar is missing or its content hash no longer matches the parquet file
+dataset_meta = read_metadata(DATA_PATH)
+if dataset_meta is None:
+    print(f"No current metadata sidecar for {DATA_PATH.name}; scanning the data instead.")
+    if PUSHDOWN:
+        # Only the columns the sidebar needs, rather than the whole table
+        dataset_meta = dataset_metadata(
+            students.select("Age", "Addicted_Score", "Country", "Most_Used_Platform").execute()
+        )
+    else:
+        dataset_meta = dataset_metadata(students_df)
+
+AGE_MIN, AGE_MAX = (int(v) for v in dataset_meta["ranges"]["Age"])
+MIN_SCORE, MAX_SCORE = (float(v) for v in dataset_meta["ranges"]["Addicted_Score"])
+
+_countries = sorted(v for v in dataset_meta["values"]["Country"]["values"] if v is not None)
+_platforms = sorted(v for v in dataset_meta["values"]["Most_Used_Platform"]["values"] if v is not None)
+
+# Row-position index for in-memory filtering; pushdown mode filters in DuckDB
+students_index = None if PUSHDOWN else DashboardFilterIndex(students_df)
+# Aggregate cube for the tiles and summary charts (built by DuckDB in pushdown mode)
+students_cube = DashboardCube(students if PUSHDOWN else students_df)
+
+# Process-wide cache of filtered row positions and chart aggregates, shared by all sessions
+result_cache = LRUCache(
+    max_entries=int(os.getenv("DASHBOARD_CACHE_ENTRIES", "512")),
+    max_bytes=int(float(os.getenv("DASHBOARD_CACHE_MB", "64")) * 1024 * 1024),
 )
-_platforms = sorted(
-    students.select(students.Most_Used_Platform).distinct().execute()["Most_Used_Platform"].tolist()
+
+# ── Background computation ───────────────────────────────────────────
+# Filtering, aggregation and figure building for the dashboard tab run on this
+# pool (pandas, numpy and DuckDB release the GIL), one ExtendedTask per session,
+# so a slow chart never blocks the session's event loop
+dashboard_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DASHBOARD_WORKERS", "4")), thread_name_prefix="dashboard"
 )
 
+# The ibis DuckDB connection is not safe to use from several threads at once
+pushdown_lock = threading.Lock()
+
+
+class Superseded(Exception):
+    """
+    Raised in a worker when a newer filter state has replaced the one it computes.
+    """
+
+
+def cached(name, key, compute):
+    value = result_cache.get_or_compute((name, key), compute)
+    # Cached frames are shared across sessions; renderers get their own copy
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+@instrumented
+def filtered_df(filters, key, session_filter):
+    # In pushdown mode this is an unexecuted ibis expression
+    if PUSHDOWN:
+        return apply_dashboard_filters(students, **filters)
+    positions = cached("positions", key, lambda: session_filter.positions(**filters))
+    # Narrowing filters start from this result instead of the full dataset
+    session_filter.remember(key, positions)
+    return students_df.iloc[positions]
+
+
+# Every aggregate the dashboard tab shows, computed in one pass over the cube
+# cells for the current filters
+@instrumented
+def dashboard_summary(filters, key):
+    return cached("summary", key, lambda: summarize_dashboard(students_cube.query(**filters)))
+
+
+def no_data_figure():
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_annotation(**NO_DATA_ANNOTATION)
+    return fig
+
+
+def scatter_figure(filters, key, session_filter, summary):
+    if summary.tiles["Students"] == 0:
+        return charts().no_data_chart(height=300)
+    with pushdown_lock if PUSHDOWN else contextlib.nullcontext():
+        if PUSHDOWN and summary.tiles["Students"] > SCATTER_MAX_POINTS:
+            # Bin in the database rather than pulling every point back
+            return charts().build_binned_scatter_chart(bin_scatter(filtered_df(filters, key, session_filter)))
+        d = select_columns(filtered_df(filters, key, session_filter), charts().SCATTER_COLUMNS)
+    return charts().build_scatter_chart(d, SCATTER_MAX_POINTS)
+
+
+def donut_figure(level_counts):
+    import plotly.express as px
+
+    level_counts = level_counts.copy()
+
+    total = int(level_counts["Count"].sum()) if len(level_counts) else 0
+
+    if total > 0:
+        level_counts["Percentage"] = (level_counts["Count"] / total * 100).astype(str) + "%"
+    else:
+        level_counts["Percentage"] = []
+
+    fig = px.pie(
+        level_counts,
+        names="Academic_Level",
+        values="Count",
+        color="Academic_Level",
+        color_discrete_map={
+            "Undergraduate": "#1e3a6e",
+            "Graduate": "#5ba4cf",
+        },
+        hole=0.4,
+        custom_data=["Percentage"],
+    )
+
+    fig.update_traces(
+        textinfo="percent",
+        hovertemplate=(
+            "<b>%{label}</b><br>"
+            "Students: %{value}<br>"
+            "<extra></extra>"
+        ),
+        textfont=dict(size=10, color="white"),
+        domain=dict(x=[0, 0.6]),
+    )
+
+    fig.update_layout(
+        legend=dict(
+            orientation="v",
+            x=0.62,
+            y=0.5,
+            xanchor="left",
+            yanchor="middle"
+        ),
+    )
+
+    return fig
+
+
+def sunburst_figure(platform_counts):
+    import plotly.express as px
+
+    color_map = {"Facebook":  "#1e3a6e",
+                "Instagram": "#2d6be4",
+                "KakaoTalk": "#5ba4cf",
+                "LINE":      "#4f6bed",
+                "LinkedIn":  "#7b8fab",
+                "Snapchat":  "#a8b8cc",
+                "TikTok":    "#0f1f3d",
+                "Twitter":   "#3a5a9e",
+                "VKontakte": "#6d8fc0",
+                "WeChat":    "#b8c8e0",
+                "WhatsApp":  "#d0dff0",
+                "YouTube":   "#bfd4e8",
+                "Other":     "#4a5a6e",
+                "Female":    "#5ba4cf",
+                "Male":      "#1e3a6e",
+            }
+
+    fig = px.sunburst(
+        platform_counts,
+        path=["Gender", "Platform_Group"],
+        values="Count",
+        color="Platform_Group",
+        color_discrete_map=color_map,
+    )
+
+    fig.update_traces(
+        textinfo="label+percent entry",
+        insidetextorientation="horizontal",
+        hovertemplate=(
+            "<b>%{label}</b><br>"
+            "Students: %{value}<br>"
+            "Percentage: %{percentEntry:.1%}<extra></extra>"
+        )
+    )
+    fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
+
+    return fig
+
+
+def build_dashboard(filters, key, session_filter, session_lock, cancelled):
+    """
+    Compute everything the dashboard tab shows for one filter state.
+
+    Runs on `dashboard_pool`. Before each stage it raises `Superseded` once
+    `cancelled` is set, so a thread whose result is no longer wanted frees
+    up quickly. `session_lock` keeps one session's computations (and its
+    IncrementalFilter) in order. Each stage is timed as a "build" series
+    named after the output it produces, since the renderers only hand over
+    the prebuilt figures.
+
+    Returns
+    -------
+    dict
+        The filter key, the DashboardSummary, and a figure per chart output.
+    """
+    def stage(name, build):
+        if cancelled.is_set():
+            raise Superseded(key)
+        start = time.perf_counter()
+        try:
+            return build()
+        finally:
+            if METRICS:
+                render_metrics.observe(name, "build", time.perf_counter() - start)
+
+    with session_lock:
+        summary = stage("dashboard_summary", lambda: dashboard_summary(filters, key))
+        results = dict(key=key, summary=summary)
+        empty = summary.tiles["Students"] == 0
+
+        results["scatter_chart"] = stage(
+            "scatter_chart", lambda: scatter_figure(filters, key, session_filter, summary)
+        )
+        results["plot_AAP"] = stage("plot_AAP", lambda: (
+            charts().no_data_chart(height=200) if empty
+            else charts().build_academic_performance_chart(summary.academic_performance)
+        ))
+        results["plot_academiclvldist"] = stage("plot_academiclvldist", lambda: (
+            charts().no_data_chart(height=200) if empty
+            else charts().build_level_gender_chart(summary.level_gender)
+        ))
+        results["donut_academic_level"] = stage("donut_academic_level", lambda: (
+            no_data_figure() if empty else donut_figure(summary.academic_level)
+        ))
+        results["sunburst_platform"] = stage("sunburst_platform", lambda: (
+            no_data_figure().update_layout(margin=dict(l=10, r=10, t=10, b=10)) if empty
+            else sunburst_figure(summary.platforms)
+        ))
+        return results
+
+
 # ── LLM setup ────────────────────────────────────────────────────────
-load_dotenv()
 greeting = "Hello! Welcome to your Social Media Addiction data dashboard. I'm here to help you filter, sort, and analyze the data."
-_df_for_qc = students.execute()
-students_df = _df_for_qc.copy()
-qc = QueryChat(_df_for_qc, "df", greeting=greeting, client="anthropic/claude-3-haiku-20240307")
+
+
+@functools.cache
+def querychat():
+    """
+    The process-wide QueryChat, built when a session first opens the chatbot tab.
+    """
+    from querychat import QueryChat
+
+    from .chat_source import CompactFrameSource
+
+    # QUERYCHAT_CLIENT picks another chatlas provider/model, e.g. the local stub
+    # used by benchmarks/load_test.py. The LLM's SQL runs on a view that casts
+    # the compact frame to int64 and plain strings, so it cannot overflow int8
+    # columns and no widened copy of the data is kept. In pushdown mode this is
+    # the first time the rows are loaded into pandas.
+    return QueryChat(
+        CompactFrameSource(compact_dtypes(read_students(DATA_PATH)) if PUSHDOWN else students_df, "df"),
+        "df",
+        greeting=greeting,
+        client=os.getenv("QUERYCHAT_CLIENT", "anthropic/claude-3-haiku-20240307"),
+    )
+
+
+if PUSHDOWN:
+    print(
+        f"Serving {dataset_meta['row_count']:,} students from DuckDB: no rows resident, "
+        f"{frame_nbytes(students_cube.cells):,} bytes cube"
+    )
+else:
+    # Every consumer reads the one frame: the dashboard, QueryChat's DuckDB view
+    # and downloads, so these three parts are all the data resident at startup
+    _resident = {
+        "frame": frame_nbytes(students_df),
+        "filter index": students_index.nbytes,
+        "cube": frame_nbytes(students_cube.cells),
+    }
+    print(
+        f"Loaded {len(students_df):,} students: {_raw_nbytes:,} bytes as read, "
+        f"{sum(_resident.values()):,} bytes resident in total ("
+        + ", ".join(f"{nbytes:,} bytes {part}" for part, nbytes in _resident.items())
+        + "; the frame is shared by the dashboard, QueryChat and downloads)"
+    )
 
 # ── UI ───────────────────────────────────────────────────────────────
 
@@ -315,97 +674,167 @@ app_ui = ui.page_fluid(
 
         ui.nav_panel(
             "Chatbot",
-            ui.layout_sidebar(
+            # Rendered by the server the first time the tab is opened
+            ui.output_ui("chatbot_panel"),
+        ),
+        id="tabs",
+    ),
+)
 
-                qc.sidebar(
-                    open="desktop",
-                    bg="#EEF1F6",
-                    fg="#0F1F3D",
-                ),
 
-                ui.layout_columns(
-                    ui.input_action_button("reset", "Reset Filters"),
-                    ui.download_button("download_csv", "Download CSV")
-                ),
+def chatbot_panel_ui():
+    return ui.layout_sidebar(
 
-                ui.card(
-                    ui.card_header("Filtered Data"),
-                    ui.output_data_frame("chat_df"),
-                ),
+        querychat().sidebar(
+            open="desktop",
+            bg="#EEF1F6",
+            fg="#0F1F3D",
+        ),
 
-                ui.layout_columns(
-                    ui.card(
-                        ui.card_header("Impact on Academic Performance"),
-                        output_widget("plot_AAP_bot"),
-                        full_screen=True,
-                    ),
+        ui.layout_columns(
+            ui.input_action_button("reset", "Reset Filters"),
+            ui.input_select(
+                id="export_format",
+                label=None,
+                choices=EXPORT_FORMATS,
+                selected="csv",
+            ),
+            ui.download_button("download_csv", "Download Data")
+        ),
 
-                    ui.card(
-                        ui.card_header("Academic Level Distribution by Gender"),
-                        output_widget("plot_academiclvldist_bot"),
-                        full_screen=True,
-                    ),
-                ),
+        ui.card(
+            ui.card_header("Filtered Data"),
+            ui.output_data_frame("chat_df"),
+        ),
 
-                ui.card(
-                    ui.card_header("Addiction vs Mental Health & Sleep"),
-                    output_widget("scatter_chart_bot"),
-                    full_screen=True,
-                ),
-            )
-        )
-    ),
-)
+        ui.layout_columns(
+            ui.card(
+                ui.card_header("Impact on Academic Performance"),
+                output_widget("plot_AAP_bot"),
+                full_screen=True,
+            ),
+
+            ui.card(
+                ui.card_header("Academic Level Distribution by Gender"),
+                output_widget("plot_academiclvldist_bot"),
+                full_screen=True,
+            ),
+        ),
+
+        ui.card(
+            ui.card_header("Addiction vs Mental Health & Sleep"),
+            output_widget("scatter_chart_bot"),
+            full_screen=True,
+        ),
+    )
 
 # ── SERVER ───────────────────────────────────────────────────────────
 
 def server(input, output, session):
 
-    # Close the DuckDB connection when the user's browser session ends (prevents resource leaks on the server)
-    # session.on_ended(con.disconnect)
+    if METRICS:
+        instrument_session(render_metrics, session)
 
-    qc_data = qc.server()
+    # QueryChat's server values, set when the chatbot tab is first opened
+    chatbot = reactive.value(None)
+
+    def qc_data():
+        # Chatbot outputs wait silently until the tab has been opened
+        return req(chatbot.get())
+
+    @reactive.effect
+    @reactive.event(input.tabs)
+    def _open_chatbot():
+        if input.tabs() != "Chatbot" or chatbot.get() is not None:
+            return
+        values = querychat().server()
+        if METRICS:
+            instrument_chat_client(render_metrics, values.client)
+        chatbot.set(values)
 
     # Stores the country clicked on the map
     selected_country_map = reactive.value(None)
 
-    custom_ui_scale = alt.Scale(
-        range=['#0F1F3D', '#2D6BE4', '#26f7fd'],
-        type='linear'
-    )
-
-    def no_data_chart(height=300):
-        return (
-            alt.Chart(pd.DataFrame({"x": [0.5], "y": [0.5], "text": ["No data available"]}))
-            .mark_text(size=20, color="gray")
-            .encode(
-                x=alt.X("x:Q", axis=None, scale=alt.Scale(domain=[0, 1])),
-                y=alt.Y("y:Q", axis=None, scale=alt.Scale(domain=[0, 1])),
-                text="text:N",
-            )
-            .properties(width="container", height=height)
-            .configure_view(strokeWidth=0, fill="#F4F6F9")
-            .configure_axis(grid=False)
-        )
-    
+    # Per-session filter state so drill-downs only re-filter the current subset
+    session_filter = None if PUSHDOWN else IncrementalFilter(students_index)
 
     # ── Filtered data ────────────────────────────────────────────────
-    @reactive.calc
-    def filtered_df():
-        clicked_country = selected_country_map.get()
-        
-        return apply_dashboard_filters(
-            students_df,
+    def sidebar_filters():
+        return dict(
             gender=input.f_gender(),
             age_range=input.f_age(),
             academic_level=input.f_level(),
             countries=list(input.f_country()) if input.f_country() else None,
             platforms=list(input.f_platform()) if input.f_platform() else None,
-            clicked_country=clicked_country,
-            )
-    
+        )
+
+    # Only the settled sidebar state reaches filtered_df() and the outputs;
+    # map clicks are single events and apply at once
+    settled_filters = debounced(sidebar_filters, FILTER_DEBOUNCE_SECONDS, render_metrics if METRICS else None)
+
+    @reactive.calc
+    @instrumented
+    def filters():
+        return dict(settled_filters(), clicked_country=selected_country_map.get())
+
+    @reactive.calc
+    @instrumented
+    def filter_key():
+        return normalize_filters(**filters())
+
+    # ── Background computation ───────────────────────────────────────
+    # Computations of one session run one at a time, in the order requested
+    session_lock = threading.Lock()
+    # Set to abandon the computation in flight
+    cancel_running = threading.Event()
+    # The latest finished computation; outputs keep showing it until a newer one lands
+    dashboard = reactive.value(None)
+
+    @reactive.extended_task
+    async def compute_dashboard(filters, key, cancelled):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            dashboard_pool, build_dashboard, filters, key, session_filter, session_lock, cancelled
+        )
+
+    @reactive.effect
+    def _recompute_dashboard():
+        nonlocal cancel_running
+        filters_now, key = filters(), filter_key()
+        # A newer filter state supersedes the running computation: its task is
+        # cancelled and its worker thread stops at the next stage
+        cancel_running.set()
+        compute_dashboard.cancel()
+        cancel_running = threading.Event()
+        compute_dashboard.invoke(filters_now, key, cancel_running)
+
+    @reactive.effect
+    def _publish_dashboard():
+        status = compute_dashboard.status()
+        if status == "success":
+            results = compute_dashboard.value.get()
+            # Discard a result that finished just as newer filters arrived
+            with reactive.isolate():
+                if results["key"] == filter_key():
+                    dashboard.set(results)
+        elif status == "error":
+            dashboard.set(compute_dashboard.error.get())
+
+    def current():
+        results = req(dashboard.get())
+        if isinstance(results, BaseException):
+            raise results
+        return results
+
+    def tile_summary():
+        return current()["summary"].tiles
+
+    def is_empty():
+        return tile_summary()["Students"] == 0
+
     
     # ── Clicked country display ──────────────────────────────────────
+    @instrumented
     @render.text
     def selected_country_text():
         clicked_country = selected_country_map.get()
@@ -419,116 +848,49 @@ def server(input, output, session):
         selected_country_map.set(None)
 
     # ── Stat tiles ───────────────────────────────────────────────────
+    @instrumented
     @render.text
     def tile_students():
-        return str(len(filtered_df()))
+        return str(tile_summary()["Students"])
 
+    @instrumented
     @render.text
     def tile_usage():
-        d = filtered_df()
-        return f"{d['Avg_Daily_Usage_Hours'].mean():.1f}h" if len(d) else "—"
+        t = tile_summary()
+        return f"{t['Avg_Daily_Usage_Hours']:.1f}h" if t["Students"] else "—"
 
+    @instrumented
     @render.text
     def tile_sleep():
-        d = filtered_df()
-        return f"{d['Sleep_Hours_Per_Night'].mean():.1f}h" if len(d) else "—"
+        t = tile_summary()
+        return f"{t['Sleep_Hours_Per_Night']:.1f}h" if t["Students"] else "—"
 
+    @instrumented
     @render.text
     def tile_addiction():
-        d = filtered_df()
-        return f"{d['Addicted_Score'].mean():.1f}" if len(d) else "—"
+        t = tile_summary()
+        return f"{t['Addicted_Score']:.1f}" if t["Students"] else "—"
 
+    @instrumented
     @render_altair
     def scatter_chart():
-        d = filtered_df()
-        if d.empty:
-            return no_data_chart(height=300)
-        fig = alt.Chart(d).transform_calculate(
-            jitter_addiction="datum.Addicted_Score + 0.4 * (random() + random() - 1)",
-            jitter_mental="datum.Mental_Health_Score + 0.4 * (random() + random() - 1)"
-        ).mark_circle(size=50, opacity=0.7).encode(
-            x=alt.X(
-                "jitter_addiction:Q",
-                title="Addiction Score",
-                scale=alt.Scale(zero=False)
-            ),
-            y=alt.Y(
-                "jitter_mental:Q",
-                title="Mental Health Score",
-                scale=alt.Scale(zero=False)
-            ),
-            color=alt.Color(
-                "Sleep_Hours_Per_Night",
-                title="Sleep Time (hrs)",
-                scale=custom_ui_scale
-            ),
-            tooltip=["Addicted_Score", "Mental_Health_Score", "Sleep_Hours_Per_Night"]
-        ).interactive()
-
-        return fig
+        return current()["scatter_chart"]
 
     # ── Map with click interaction ───────────────────────────────────
+    # The figure, grey world layer and click wiring are built once per session;
+    # _update_map() then patches only the data layer when the filters change.
+    @instrumented
     @render_plotly
     def map_chart():
-        d = filtered_df().copy()
-        if d.empty:
-            fig = go.Figure()
-            fig.add_annotation(text="No data available", x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False, font=dict(size=20, color="gray"))
-            fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
-            return fig
-        
-        df_selected = d.groupby("Country", as_index=False).agg({
-            "Student_ID": "count",
-            "Avg_Daily_Usage_Hours": "mean",
-            "Sleep_Hours_Per_Night": "mean",
-            "Addicted_Score": "mean",
-        })
-
-        def get_iso3(country_name):
-            try:
-                return pycountry.countries.search_fuzzy(country_name)[0].alpha_3
-            except:
-                return None # Handle unrecognized countries
-
-        df_selected['iso_alpha'] = df_selected['Country'].apply(get_iso3)
-        df_selected = df_selected.dropna(subset=['iso_alpha'])
-
-        all_iso = [c.alpha_3 for c in pycountry.countries]
-        no_data_iso = [iso for iso in all_iso if iso not in df_selected["iso_alpha"].values]
-
-        fig = px.choropleth(
-            df_selected,
-            locations="iso_alpha",
-            locationmode="ISO-3",
-            color="Addicted_Score",
-            color_continuous_scale=[
-                [0.0, "#0F1F3D"],
-                [0.3, "#517BD6"],
-                [1.0, "#26f7fd"]
-            ],
-            range_color=[MIN_SCORE, MAX_SCORE],
-            hover_name="Country",
-            custom_data=["Country"],
-            labels={
-                "Student_ID": "Total Students",
-                "Avg_Daily_Usage_Hours": "Avg Daily Usage (hrs)",
-                "Sleep_Hours_Per_Night": "Sleep per Night (hrs)",
-                "Addicted_Score": "Addicted Score"
-            },
-            hover_data={
-                "Country": False,
-                "iso_alpha": False,
-                "Student_ID": True,
-                "Avg_Daily_Usage_Hours": ":.1f",
-                "Sleep_Hours_Per_Night": ":.1f",
-                "Addicted_Score": ":.1f"
-            },
-        )
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
 
+        # Grey no-data layer under every country; the data layer is drawn on top
         fig.add_trace(
             go.Choropleth(
-                locations=no_data_iso,
-                z=[0] * len(no_data_iso),
+                locations=world_iso3(),
+                z=[0] * len(world_iso3()),
                 locationmode="ISO-3",
                 colorscale=[[0, "#d3d3d3"], [1, "#d3d3d3"]],
                 showscale=False,
@@ -537,12 +899,38 @@ def server(input, output, session):
             )
         )
 
-        # Put the grey no-data layer below the real data layer
-        fig.data = fig.data[::-1]
+        fig.add_trace(
+            go.Choropleth(
+                locations=[],
+                z=[],
+                customdata=[],
+                locationmode="ISO-3",
+                coloraxis="coloraxis",
+                hovertemplate=(
+                    "<b>%{customdata[0]}</b><br><br>"
+                    "Total Students=%{customdata[1]}<br>"
+                    "Avg Daily Usage (hrs)=%{customdata[2]:.1f}<br>"
+                    "Sleep per Night (hrs)=%{customdata[3]:.1f}<br>"
+                    "Addicted Score=%{z:.1f}<extra></extra>"
+                ),
+            )
+        )
 
-        fig.update_coloraxes(reversescale=True)
+        fig.update_layout(
+            coloraxis=dict(
+                colorscale=[
+                    [0.0, "#0F1F3D"],
+                    [0.3, "#517BD6"],
+                    [1.0, "#26f7fd"]
+                ],
+                cmin=MIN_SCORE,
+                cmax=MAX_SCORE,
+                reversescale=True,
+                colorbar=dict(title="Addicted Score"),
+            ),
+            margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        )
         fig.update_geos(fitbounds="locations", showframe=False)
-        fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
 
         widget = go.FigureWidget(fig)
 
@@ -550,296 +938,120 @@ def server(input, output, session):
             if not points.point_inds:
                 return
 
-            # Ignore grey no-data layer because it has no customdata
-            if getattr(trace, "customdata", None) is None:
-                return
-
             idx = points.point_inds[0]
             country = trace.customdata[idx][0]
             selected_country_map.set(country)
 
-        for trace in widget.data:
-            trace.on_click(handle_click)
+        # Only the data layer is clickable; grey countries have no students
+        widget.data[1].on_click(handle_click)
 
         return widget
 
+    @reactive.effect
+    def _update_map():
+        widget = map_chart.widget
+        results = req(dashboard.get())
+        if isinstance(results, BaseException):
+            # The renderers show the failed build inline; raising here would be
+            # an unhandled error in an effect, which closes the whole session
+            return
+        summary = results["summary"]
+        # The map is rendered once per session and updated here on every filter
+        # change, so this patch is what the map_chart latency series times
+        start = time.perf_counter()
+
+        # iso_alpha is resolved once in prep_data.py; unmatched countries have no shape
+        df_selected = summary.countries.dropna(subset=["iso_alpha"])
+        hover_columns = ["Country", "Student_ID", "Avg_Daily_Usage_Hours", "Sleep_Hours_Per_Night"]
+
+        with widget.batch_update():
+            data_layer = widget.data[1]
+            data_layer.locations = df_selected["iso_alpha"].tolist()
+            data_layer.z = df_selected["Addicted_Score"].tolist()
+            data_layer.customdata = df_selected[hover_columns].values.tolist()
+            widget.layout.annotations = [NO_DATA_ANNOTATION] if summary.tiles["Students"] == 0 else []
+
+        if METRICS:
+            render_metrics.observe("map_chart", "render", time.perf_counter() - start)
+
     # ── Chart 1: Impact on academic performance ──────────────────────
+    @instrumented
     @render_altair
     def plot_AAP():
-        df1 = filtered_df()
-        if df1.empty:
-            return no_data_chart(height=200)
-        #calculate the percentage
-        percent = (df1.groupby("Affects_Academic_Performance").size().reset_index(name="Count"))
-        percent["Percentage"] = (percent["Count"] / percent["Count"].sum() * 100).round(1)
-        percent["label"] = percent["Percentage"].astype(str) + "%"
-
-        chart = alt.Chart(percent).mark_bar().encode(
-            alt.Y("Affects_Academic_Performance:N", title="Impact on Academic Performance"),
-            alt.X("Percentage:Q", title="Percentage of Students"),
-            alt.Color(
-                "Affects_Academic_Performance:N",
-                scale=alt.Scale(domain=["Yes", "No"], range=["#c0392b", "#1e3a6e"]),
-                legend=None
-            ),
-            tooltip=[
-                alt.Tooltip("Affects_Academic_Performance:N", title="Affects Academic Performance?"),
-                alt.Tooltip("Count:Q", title="Number of Students"),
-                alt.Tooltip("Percentage:Q", title="Percentage of Students being Affected")
-            ]
-        )
-
-        return chart + chart.mark_text(align="left").encode(
-            text=alt.Text("label:N"),
-            color=alt.value("black")
-        )
+        return current()["plot_AAP"]
 
     # ── Chart 2: Academic level donut ────────────────────────────────
+    @instrumented
     @render_plotly
     def donut_academic_level():
-        d = filtered_df()
-        if d.empty:
-            fig = go.Figure()
-            fig.add_annotation(text="No data available", x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False, font=dict(size=20, color="gray"))
-            return fig
-
-        level_counts = (
-            d.groupby("Academic_Level")
-            .size()
-            .reset_index(name="Count")
-        )
-
-        total = int(level_counts["Count"].sum()) if len(level_counts) else 0
-
-        if total > 0:
-            level_counts["Percentage"] = (level_counts["Count"] / total * 100).astype(str) + "%"
-        else:
-            level_counts["Percentage"] = []
-
-        fig = px.pie(
-            level_counts,
-            names="Academic_Level",
-            values="Count",
-            color="Academic_Level",
-            color_discrete_map={
-                "Undergraduate": "#1e3a6e",
-                "Graduate": "#5ba4cf",
-            },
-            hole=0.4,
-            custom_data=["Percentage"],
-        )
-
-        fig.update_traces(
-            textinfo="percent",
-            hovertemplate=(
-                "<b>%{label}</b><br>"
-                "Students: %{value}<br>"
-                "<extra></extra>"
-            ),
-            textfont=dict(size=10, color="white"),
-            domain=dict(x=[0, 0.6]),
-        )
-
-        fig.update_layout(
-            legend=dict(
-                orientation="v",
-                x=0.62,
-                y=0.5,
-                xanchor="left",
-                yanchor="middle"
-            ),
-        )
-
-        return fig
+        return current()["donut_academic_level"]
 
     # ── Chart 3: Academic level distribution by gender ───────────────
+    @instrumented
     @render_altair
     def plot_academiclvldist():
-        df = filtered_df()
-        if df.empty:
-            return no_data_chart(height=200)
-
-        group_gender_df = df.groupby(["Academic_Level", "Gender"]).size().reset_index(name="Count")
-
-        chart = alt.Chart(group_gender_df).mark_bar().encode(
-            alt.X(
-                "Academic_Level:N",
-                title="Academic Level",
-                sort=["Undergraduate", "Graduate"],
-                axis=alt.Axis(labelAngle=0)
-            ),
-            alt.Y("Count:Q", title="Number of Students"),
-            alt.Color(
-                "Gender:N",
-                scale=alt.Scale(domain=["Male", "Female"], range=["#1e3a6e", "#5ba4cf"]),
-                legend=alt.Legend(title="Gender"),
-            ),
-            order=alt.Order("Gender:N", sort="ascending"),
-            tooltip=[
-                alt.Tooltip("Academic_Level:N", title="Academic Level"),
-                alt.Tooltip("Gender:N", title="Gender"),
-                alt.Tooltip("Count:Q", title="Number of Students")
-            ]
-        )
-
-        return chart
+        return current()["plot_academiclvldist"]
 
     # ── Chart 4: Platform distribution ───────────────────────────────
+    @instrumented
     @render_plotly
     def sunburst_platform():
-        d = filtered_df()
-        if d.empty:
-            fig = go.Figure()
-            fig.add_annotation(text="No data available", x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False, font=dict(size=20, color="gray"))
-            fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
-            return fig
-
-        platform_counts = group_platforms_for_sunburst(d)
-        
-        color_map = {"Facebook":  "#1e3a6e",
-                    "Instagram": "#2d6be4",
-                    "KakaoTalk": "#5ba4cf",
-                    "LINE":      "#4f6bed",
-                    "LinkedIn":  "#7b8fab",
-                    "Snapchat":  "#a8b8cc",
-                    "TikTok":    "#0f1f3d",
-                    "Twitter":   "#3a5a9e",
-                    "VKontakte": "#6d8fc0",
-                    "WeChat":    "#b8c8e0",
-                    "WhatsApp":  "#d0dff0",
-                    "YouTube":   "#bfd4e8",
-                    "Other":     "#4a5a6e",
-                    "Female":    "#5ba4cf",
-                    "Male":      "#1e3a6e",
-                }
-
-        fig = px.sunburst(
-            platform_counts,
-            path=["Gender", "Platform_Group"],
-            values="Count",
-            color="Platform_Group",
-            color_discrete_map=color_map,
-        )
-
-        fig.update_traces(
-            textinfo="label+percent entry",
-            insidetextorientation="horizontal",
-            hovertemplate=(
-                "<b>%{label}</b><br>"
-                "Students: %{value}<br>"
-                "Percentage: %{percentEntry:.1%}<extra></extra>"
-            )
-        )
-        fig.update_layout(margin=dict(l=10, r=10, t=10, b=10))
-
-        return fig
+        return current()["sunburst_platform"]
 
     # ── Chatbot tab ──────────────────────────────────────────────────
+    @instrumented
+    @render.ui
+    def chatbot_panel():
+        qc_data()
+        return chatbot_panel_ui()
+
+    @instrumented
     @render.data_frame
     def chat_df():
-        return qc_data.df()
+        return qc_data().df()
 
-    @render.download(filename="social_media_data.csv")
+    @instrumented
+    @render.download(
+        filename=lambda: f"social_media_data.{EXPORT_EXTENSIONS[input.export_format()]}"
+    )
     def download_csv():
-        yield qc_data.df().to_csv(index=False)
+        # Streamed in row chunks so large exports start at once and memory stays flat
+        yield from iter_export(qc_data().df(), input.export_format())
 
     @reactive.effect
     @reactive.event(input.reset)
     def _reset_chat():
-        qc_data.sql.set("")
-        qc_data.title.set(None)
+        qc_data().sql.set("")
+        qc_data().title.set(None)
 
+    # Same builders as the dashboard tab; the counts and charts are memoised
+    # on the content of the query result, so re-running a query is free
+    @instrumented
     @render_altair
     def plot_AAP_bot():
-        df1 = qc_data.df()
-        if df1.empty:
-            return no_data_chart(height=200)
-        #calculate the percentage
-        percent = (df1.groupby("Affects_Academic_Performance").size().reset_index(name="Count"))
-        percent["Percentage"] = (percent["Count"] / percent["Count"].sum() * 100).round(1)
-        percent["label"] = percent["Percentage"].astype(str) + "%"
-
-        chart = alt.Chart(percent).mark_bar().encode(
-            alt.Y("Affects_Academic_Performance:N", title="Impact on Academic Performance"),
-            alt.X("Percentage:Q", title="Percentage of Students"),
-            alt.Color(
-                "Affects_Academic_Performance:N",
-                scale=alt.Scale(domain=["Yes", "No"], range=["#c0392b", "#1e3a6e"]),
-                legend=None
-            ),
-            tooltip=[
-                alt.Tooltip("Affects_Academic_Performance:N", title="Affects Academic Performance?"),
-                alt.Tooltip("Count:Q", title="Number of Students"),
-                alt.Tooltip("Percentage:Q", title="Percentage of Students being Affected")
-            ]
-        )
-
-        return chart + chart.mark_text(align="left").encode(
-            text=alt.Text("label:N"),
-            color=alt.value("black")
-        )
+        df = qc_data().df()
+        if df.empty:
+            return charts().no_data_chart(height=200)
+        return charts().build_academic_performance_chart(charts().counts_for(df, ["Affects_Academic_Performance"]))
 
+    @instrumented
     @render_altair
     def plot_academiclvldist_bot():
-        df = qc_data.df()
+        df = qc_data().df()
         if df.empty:
-            return no_data_chart(height=200)
-
-        group_gender_df = df.groupby(["Academic_Level", "Gender"]).size().reset_index(name="Count")
-
-        chart = alt.Chart(group_gender_df).mark_bar().encode(
-            alt.X(
-                "Academic_Level:N",
-                title="Academic Level",
-                sort=["Undergraduate", "Graduate"],
-                axis=alt.Axis(labelAngle=0)
-            ),
-            alt.Y("Count:Q", title="Number of Students"),
-            alt.Color(
-                "Gender:N",
-                scale=alt.Scale(domain=["Male", "Female"], range=["#1e3a6e", "#5ba4cf"]),
-                legend=alt.Legend(title="Gender"),
-            ),
-            order=alt.Order("Gender:N", sort="ascending"),
-            tooltip=[
-                alt.Tooltip("Academic_Level:N", title="Academic Level"),
-                alt.Tooltip("Gender:N", title="Gender"),
-                alt.Tooltip("Count:Q", title="Number of Students")
-            ]
-        )
-
-        return chart
+            return charts().no_data_chart(height=200)
+        return charts().build_level_gender_chart(charts().counts_for(df, ["Academic_Level", "Gender"]))
 
+    @instrumented
     @render_altair
     def scatter_chart_bot():
-        d = qc_data.df()
-        if d.empty:
-            return no_data_chart(height=300)
-        fig = alt.Chart(d).transform_calculate(
-            jitter_addiction="datum.Addicted_Score + 0.4 * (random() + random() - 1)",
-            jitter_mental="datum.Mental_Health_Score + 0.4 * (random() + random() - 1)"
-        ).mark_circle(size=50, opacity=0.7).encode(
-            x=alt.X(
-                "jitter_addiction:Q",
-                title="Addiction Score",
-                scale=alt.Scale(zero=False)
-            ),
-            y=alt.Y(
-                "jitter_mental:Q",
-                title="Mental Health Score",
-                scale=alt.Scale(zero=False)
-            ),
-            color=alt.Color(
-                "Sleep_Hours_Per_Night",
-                title="Sleep Time (hrs)",
-                scale=custom_ui_scale
-            ),
-            tooltip=["Addicted_Score", "Mental_Health_Score", "Sleep_Hours_Per_Night"]
-        ).interactive()
-
-        return fig
+        return charts().build_scatter_chart(qc_data().df(), SCATTER_MAX_POINTS)
 
 
 # ── APP ──────────────────────────────────────────────────────────────
 
-app = App(app_ui, server)
\ No newline at end of file
+app = App(app_ui, server)
+
+if METRICS:
+    # Served by the same ASGI app, ahead of Shiny's own routes
+    app.starlette_app.router.routes.insert(0, metrics_route(render_metrics))
\ No newline at end of file
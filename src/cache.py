@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_filters(
+    gender: str = "All",
+    age_range: tuple[int, int] | list[int] = (0, 100),
+    academic_level: str = "All",
+    countries: list[str] | None = None,
+    platforms: list[str] | None = None,
+    clicked_country: str | None = None,
+) -> tuple:
+    """
+    Turn dashboard filter arguments into a hashable cache key.
+
+    Filters that select the same rows map to the same key: country and
+    platform lists are sorted and de-duplicated, and None and an empty list
+    are treated alike (both mean "no filter").
+
+    Returns
+    -------
+    tuple
+        (gender, (age_low, age_high), academic_level, countries, platforms, clicked_country)
+    """
+    age_low, age_high = age_range
+    return (
+        gender,
+        (int(age_low), int(age_high)),
+        academic_level,
+        tuple(sorted(set(countries))) if countries else (),
+        tuple(sorted(set(platforms))) if platforms else (),
+        clicked_country,
+    )
+
+
+def is_refinement(previous: tuple, current: tuple) -> bool:
+    """
+    Whether the `current` filter key selects a subset of the `previous` one.
+
+    Both keys come from `normalize_filters`. Each filter must either stay the
+    same or narrow: "All" to a specific value, a shorter age range inside the
+    old one, or a non-empty subset of the previously selected countries or
+    platforms. Any widening returns False.
+    """
+    prev_gender, prev_age, prev_level, prev_countries, prev_platforms, prev_clicked = previous
+    gender, age, level, countries, platforms, clicked = current
+
+    def narrows_choice(old, new, unrestricted):
+        return old == unrestricted or old == new
+
+    def narrows_set(old, new):
+        return not old or (bool(new) and set(new) <= set(old))
+
+    return (
+        narrows_choice(prev_gender, gender, "All")
+        and prev_age[0] <= age[0] and age[1] <= prev_age[1]
+        and narrows_choice(prev_level, level, "All")
+        and narrows_set(prev_countries, countries)
+        and narrows_set(prev_platforms, platforms)
+        and narrows_choice(prev_clicked, clicked, None)
+    )
+
+
+def estimate_nbytes(value: Any) -> int:
+    """
+    Approximate the memory held by a cached value.
+    """
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # e.g. a DashboardSummary, whose frames hold the memory
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(getattr(value, field.name)) for field in dataclasses.fields(value)
+        )
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by entry count and approximate memory.
+
+    One instance is shared by every Shiny session in the worker process, so
+    sessions that land on the same filter state reuse each other's work.
+
+    Parameters
+    ----------
+    max_entries : int, default=256
+        Maximum number of cached values.
+    max_bytes : int, default=64 MiB
+        Maximum approximate memory of all cached values. A single value larger
+        than this is returned but not stored.
+    sizeof : callable, default=estimate_nbytes
+        Approximate size in bytes of one value.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        sizeof: Callable[[Any], int] = estimate_nbytes,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        """
+        Hit/miss/eviction counters and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+            }
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, estimate_nbytes
+from .logic import bin_scatter, count_by, portable_dtypes
+
+SCATTER_COLUMNS = ["Addicted_Score", "Mental_Health_Score", "Sleep_Hours_Per_Night"]
+
+custom_ui_scale = alt.Scale(
+    range=['#0F1F3D', '#2D6BE4', '#26f7fd'],
+    type='linear'
+)
+
+
+def chart_nbytes(value) -> int:
+    """
+    Approximate memory of a memoised value; a chart is sized by the data
+    frames it and its layers embed (up to SCATTER_MAX_POINTS rows).
+    """
+    if not isinstance(value, alt.TopLevelMixin):
+        return estimate_nbytes(value)
+    charts, nbytes = [value], sys.getsizeof(value)
+    while charts:
+        chart = charts.pop()
+        data = getattr(chart, "data", alt.Undefined)
+        if isinstance(data, pd.DataFrame):
+            nbytes += estimate_nbytes(data)
+        for composed in ("layer", "hconcat", "vconcat", "concat"):
+            charts.extend(getattr(chart, composed, None) or [])
+    return nbytes
+
+
+# Aggregates and built charts keyed on (kind, content fingerprint), shared by
+# both tabs and every session in the worker.
+chart_memo = LRUCache(max_entries=256, max_bytes=32 * 1024 * 1024, sizeof=chart_nbytes)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a dataframe: column names, kinds of dtype and values (not the index).
+
+    Two frames with the same rows in the same order share a fingerprint even
+    when they are different objects, e.g. the chatbot's default `SELECT *`
+    result and the dataset it was run against. Values are hashed after
+    `portable_dtypes`, so the dashboard's compact frames (categoricals, int8)
+    and the chatbot's query results (strings, int64) match when their rows do.
+    """
+    df = portable_dtypes(df)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(column, dtype.kind) for column, dtype in df.dtypes.items()]).encode())
+    if len(df):
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def memoize_on_frame(kind: str, df: pd.DataFrame, build):
+    """
+    Return `build(df)`, reusing an earlier result for identical content.
+    """
+    # Charts built for one data transformer are not valid under the other
+    key = (kind, alt.data_transformers.active, frame_fingerprint(df))
+    return chart_memo.get_or_compute(key, lambda: build(df))
+
+
+def use_vegafusion(enabled: bool) -> None:
+    """
+    Switch every Altair chart between client-side and VegaFusion transforms.
+
+    With VegaFusion on, the widgets evaluate Vega transforms in this process
+    and send the browser the transformed data and a compiled Vega spec
+    instead of the Vega-Lite spec.
+
+    This does not shrink this dashboard's payloads. Its charts are already
+    built from aggregates or binned points, so there is little for the
+    server to filter away, and the compiled spec is more verbose.
+    benchmarks/bench_chart_payload.py measured every chart 1.6x-2.9x larger
+    with VegaFusion on (705, 4,000 and 100,000 rows). Leave it off unless a
+    chart gains transforms that drop rows.
+    """
+    alt.data_transformers.enable("vegafusion" if enabled else "default")
+
+
+def using_vegafusion() -> bool:
+    return alt.data_transformers.active == "vegafusion"
+
+
+def spec_payload(chart) -> dict:
+    """
+    The spec a chart widget sends to the browser under the active transformer.
+    """
+    spec = chart.to_dict(context={"pre_transform": False})
+    if not using_vegafusion():
+        return spec
+    from altair.utils._vegafusion_data import compile_to_vegafusion_chart_state
+
+    return compile_to_vegafusion_chart_state(spec, "UTC").get_transformed_spec()
+
+
+def spec_nbytes(chart) -> int:
+    """
+    Size in bytes of `spec_payload(chart)` as JSON.
+    """
+    return len(json.dumps(spec_payload(chart)).encode())
+
+
+def _serialized(chart):
+    # Serialise once while building so the data is already converted when a
+    # widget later asks the memoised chart for its spec (the same call the
+    # widget makes, which skips VegaFusion's pre-transform)
+    chart.to_dict(context={"pre_transform": False})
+    return chart
+
+
+def counts_for(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    Memoised `count_by` over row-level data.
+    """
+    return memoize_on_frame(f"counts:{','.join(columns)}", df, lambda d: count_by(d, columns))
+
+
+def no_data_chart(height=300):
+    return (
+        alt.Chart(pd.DataFrame({"x": [0.5], "y": [0.5], "text": ["No data available"]}))
+        .mark_text(size=20, color="gray")
+        .encode(
+            x=alt.X("x:Q", axis=None, scale=alt.Scale(domain=[0, 1])),
+            y=alt.Y("y:Q", axis=None, scale=alt.Scale(domain=[0, 1])),
+            text="text:N",
+        )
+        .properties(width="container", height=height)
+        .configure_view(strokeWidth=0, fill="#F4F6F9")
+        .configure_axis(grid=False)
+    )
+
+
+def _academic_performance_chart(counts: pd.DataFrame):
+    #calculate the percentage
+    percent = counts.copy()
+    percent["Percentage"] = (percent["Count"] / percent["Count"].sum() * 100).round(1)
+    percent["label"] = percent["Percentage"].astype(str) + "%"
+
+    chart = alt.Chart(percent).mark_bar().encode(
+        alt.Y("Affects_Academic_Performance:N", title="Impact on Academic Performance"),
+        alt.X("Percentage:Q", title="Percentage of Students"),
+        alt.Color(
+            "Affects_Academic_Performance:N",
+            scale=alt.Scale(domain=["Yes", "No"], range=["#c0392b", "#1e3a6e"]),
+            legend=None
+        ),
+        tooltip=[
+            alt.Tooltip("Affects_Academic_Performance:N", title="Affects Academic Performance?"),
+            alt.Tooltip("Count:Q", title="Number of Students"),
+            alt.Tooltip("Percentage:Q", title="Percentage of Students being Affected")
+        ]
+    )
+
+    return _serialized(chart + chart.mark_text(align="left").encode(
+        text=alt.Text("label:N"),
+        color=alt.value("black")
+    ))
+
+
+def build_academic_performance_chart(counts: pd.DataFrame):
+    """
+    Bar chart of the share of students whose studies are affected.
+
+    `counts` has Affects_Academic_Performance and Count columns.
+    """
+    if counts.empty:
+        return no_data_chart(height=200)
+    return memoize_on_frame("chart:academic_performance", counts, _academic_performance_chart)
+
+
+def _level_gender_chart(counts: pd.DataFrame):
+    chart = alt.Chart(counts).mark_bar().encode(
+        alt.X(
+            "Academic_Level:N",
+            title="Academic Level",
+            sort=["Undergraduate", "Graduate"],
+            axis=alt.Axis(labelAngle=0)
+        ),
+        alt.Y("Count:Q", title="Number of Students"),
+        alt.Color(
+            "Gender:N",
+            scale=alt.Scale(domain=["Male", "Female"], range=["#1e3a6e", "#5ba4cf"]),
+            legend=alt.Legend(title="Gender"),
+        ),
+        order=alt.Order("Gender:N", sort="ascending"),
+        tooltip=[
+            alt.Tooltip("Academic_Level:N", title="Academic Level"),
+            alt.Tooltip("Gender:N", title="Gender"),
+            alt.Tooltip("Count:Q", title="Number of Students")
+        ]
+    )
+
+    return _serialized(chart)
+
+
+def build_level_gender_chart(counts: pd.DataFrame):
+    """
+    Stacked bars of students per academic level, split by gender.
+
+    `counts` has Academic_Level, Gender and Count columns.
+    """
+    if counts.empty:
+        return no_data_chart(height=200)
+    return memoize_on_frame("chart:level_gender", counts, _level_gender_chart)
+
+
+def build_binned_scatter_chart(bins: pd.DataFrame):
+    """
+    One sized point per (addiction, mental health) bin from `bin_scatter`.
+    """
+    return _serialized(alt.Chart(bins).mark_circle(opacity=0.8).encode(
+        x=alt.X(
+            "Addicted_Score:Q",
+            title="Addiction Score",
+            scale=alt.Scale(zero=False)
+        ),
+        y=alt.Y(
+            "Mental_Health_Score:Q",
+            title="Mental Health Score",
+            scale=alt.Scale(zero=False)
+        ),
+        size=alt.Size("Count:Q", title="Students"),
+        color=alt.Color(
+            "Sleep_Hours_Per_Night:Q",
+            title="Avg Sleep (hrs)",
+            scale=custom_ui_scale
+        ),
+        tooltip=[
+            alt.Tooltip("Addicted_Score:Q", title="Addiction Score"),
+            alt.Tooltip("Mental_Health_Score:Q", title="Mental Health Score"),
+            alt.Tooltip("Count:Q", title="Number of Students"),
+            alt.Tooltip("Sleep_Hours_Per_Night:Q", title="Avg Sleep (hrs)", format=".1f"),
+        ]
+    ).interactive())
+
+
+def jitter_points(points: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """
+    Add the scatter's jitter columns on the server.
+
+    Same triangular jitter as the client-side `random()` transform, which
+    VegaFusion cannot evaluate.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(points)
+    # Two decimals is well below a pixel and keeps the inlined values short
+    return points.assign(
+        jitter_addiction=(points["Addicted_Score"] + 0.4 * (rng.random(n) + rng.random(n) - 1)).round(2),
+        jitter_mental=(points["Mental_Health_Score"] + 0.4 * (rng.random(n) + rng.random(n) - 1)).round(2),
+    )
+
+
+def _point_scatter_chart(points: pd.DataFrame):
+    if using_vegafusion():
+        # Keep every transform server-side so no raw rows go to the browser
+        chart = alt.Chart(jitter_points(points))
+    else:
+        chart = alt.Chart(points).transform_calculate(
+            jitter_addiction="datum.Addicted_Score + 0.4 * (random() + random() - 1)",
+            jitter_mental="datum.Mental_Health_Score + 0.4 * (random() + random() - 1)"
+        )
+    return _serialized(chart.mark_circle(size=50, opacity=0.7).encode(
+        x=alt.X(
+            "jitter_addiction:Q",
+            title="Addiction Score",
+            scale=alt.Scale(zero=False)
+        ),
+        y=alt.Y(
+            "jitter_mental:Q",
+            title="Mental Health Score",
+            scale=alt.Scale(zero=False)
+        ),
+        color=alt.Color(
+            "Sleep_Hours_Per_Night",
+            title="Sleep Time (hrs)",
+            scale=custom_ui_scale
+        ),
+        tooltip=["Addicted_Score", "Mental_Health_Score", "Sleep_Hours_Per_Night"]
+    ).interactive())
+
+
+def build_scatter_chart(df: pd.DataFrame, max_points: int):
+    """
+    Addiction vs mental-health scatter coloured by sleep.
+
+    Above `max_points` rows the points are binned on the server first so the
+    payload stays bounded.
+    """
+    if df.empty:
+        return no_data_chart(height=300)
+    points = df[SCATTER_COLUMNS]
+    if len(points) > max_points:
+        return memoize_on_frame(
+            "chart:scatter_binned", points, lambda d: build_binned_scatter_chart(bin_scatter(d))
+        )
+    return memoize_on_frame("chart:scatter", points, _point_scatter_chart)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import duckdb
+import narwhals.stable.v1 as nw
+import pandas as pd
+from querychat.types import DataFrameSource
+
+from .logic import portable_sql_types
+
+
+class CompactFrameSource(DataFrameSource):
+    """
+    QueryChat data source over the dashboard's compact frame, without a copy.
+
+    DuckDB scans the registered pandas frame in place. The table the LLM
+    queries is a view that casts each column to the type `portable_dtypes`
+    would give it (BIGINT, DOUBLE or VARCHAR), so arithmetic in generated SQL
+    cannot overflow an int8 column and query results come back with the
+    same dtypes as downloads.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The compact frame; it is shared, never modified.
+    table_name : str
+        Name of the view in SQL queries.
+    """
+
+    def __init__(self, df: pd.DataFrame, table_name: str):
+        super().__init__(nw.from_native(df, eager_only=True), table_name)
+        # DataFrameSource registers the frame itself under table_name
+        self._conn.unregister(table_name)
+        self.register_into(self._conn)
+
+    def register_into(self, conn: duckdb.DuckDBPyConnection, table_name: str | None = None) -> None:
+        """
+        Register the frame under a private name and the casting view as `table_name`.
+        """
+        table_name = table_name or self.table_name
+        compact = f"{table_name}__compact"
+        df = self.get_data()
+        types = portable_sql_types(df)
+        columns = ", ".join(
+            f'CAST("{column}" AS {types[column]}) AS "{column}"' if column in types else f'"{column}"'
+            for column in df.columns
+        )
+        conn.register(compact, df)
+        conn.execute(f'CREATE VIEW "{table_name}" AS SELECT {columns} FROM "{compact}"')
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Column order and types of data/processed/Students-Social-Media-Addiction.parquet
+STUDENT_SCHEMA = pa.schema([
+    ("Student_ID", pa.int64()),
+    ("Age", pa.int64()),
+    ("Gender", pa.string()),
+    ("Academic_Level", pa.string()),
+    ("Country", pa.string()),
+    ("Avg_Daily_Usage_Hours", pa.float64()),
+    ("Most_Used_Platform", pa.string()),
+    ("Sleep_Hours_Per_Night", pa.float64()),
+    ("Mental_Health_Score", pa.int64()),
+    ("Relationship_Status", pa.string()),
+    ("Conflicts_Over_Social_Media", pa.int64()),
+    ("Addicted_Score", pa.int64()),
+    ("Affects_Academic_Performance", pa.string()),
+    ("iso_alpha", pa.string()),
+])
+
+# Column order of the processed student table (the single parquet file)
+STUDENT_COLUMNS = STUDENT_SCHEMA.names
+
+# Directory levels of an ingested dataset: <dataset>/Country=<name>/batch_date=<date>/
+PARTITION_COLUMNS = ["Country", "batch_date"]
+
+PARQUET_COMPRESSIONS = ["snappy", "zstd", "gzip", "lz4_raw", "uncompressed"]
+
+
+@dataclass(frozen=True)
+class ParquetLayout:
+    """
+    How prep_data.py writes the processed parquet data.
+
+    Sorting by the columns the dashboard filters on clusters equal values
+    into few row groups, so their min/max statistics let DuckDB skip the
+    rest. The defaults reproduce DuckDB's own layout in Student_ID order.
+
+    Parameters
+    ----------
+    sort_by : tuple of str, default=("Student_ID",)
+        Columns the rows are ordered by.
+    row_group_size : int, default=122_880
+        Rows per row group (DuckDB rounds this to a multiple of 2,048).
+    compression : str, default="snappy"
+        One of `PARQUET_COMPRESSIONS`.
+    dictionary : bool, default=True
+        Whether columns may be dictionary-encoded.
+    """
+
+    sort_by: tuple[str, ...] = ("Student_ID",)
+    row_group_size: int = 122_880
+    compression: str = "snappy"
+    dictionary: bool = True
+
+    def __post_init__(self):
+        if self.compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"compression must be one of {PARQUET_COMPRESSIONS}, got {self.compression!r}")
+        if self.row_group_size < 1:
+            raise ValueError(f"row_group_size must be positive, got {self.row_group_size}")
+
+    def to_dict(self) -> dict:
+        """
+        The layout as JSON-friendly values.
+        """
+        return {
+            "sort_by": list(self.sort_by),
+            "row_group_size": self.row_group_size,
+            "compression": self.compression,
+            "dictionary": self.dictionary,
+        }
+
+    def order_by(self) -> str:
+        """
+        SQL `ORDER BY` clause for the sort keys (empty when there are none).
+        """
+        if not self.sort_by:
+            return ""
+        return "ORDER BY " + ", ".join(f'"{column}"' for column in self.sort_by)
+
+    def copy_options(self) -> str:
+        """
+        Options for DuckDB's `COPY ... (FORMAT PARQUET, <options>)`.
+        """
+        options = [f"ROW_GROUP_SIZE {self.row_group_size}", f"COMPRESSION '{self.compression}'"]
+        if not self.dictionary:
+            options.append("DICTIONARY_SIZE_LIMIT 0")
+        return ", ".join(options)
+
+
+def is_partitioned(path: str | Path) -> bool:
+    """
+    Whether `path` is a hive-partitioned dataset directory rather than one file.
+    """
+    return Path(path).is_dir()
+
+
+def _hive_dataset(path: str | Path) -> ds.Dataset:
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def dataset_columns(path: str | Path) -> list[str]:
+    """
+    Column names of a parquet file or partitioned dataset, read from metadata only.
+    """
+    if is_partitioned(path):
+        return _hive_dataset(path).schema.names
+    return pq.read_schema(path).names
+
+
+def read_students(path: str | Path) -> pd.DataFrame:
+    """
+    Load the student table from a parquet file or a partitioned dataset.
+
+    The partition columns of a dataset come back as ordinary columns, in the
+    same order as the single-file table; `batch_date` only places rows in
+    the directory layout and is not returned.
+    """
+    if not is_partitioned(path):
+        return pd.read_parquet(path)
+    table = _hive_dataset(path).to_table(columns=STUDENT_COLUMNS)
+    return table.to_pandas()
+
+
+def students_table(con, path: str | Path):
+    """
+    Register the student data with an ibis connection and return the table.
+
+    A partitioned dataset is read with hive partitioning, so DuckDB skips
+    every file whose Country partition fails a country filter or map click.
+    """
+    if is_partitioned(path):
+        return con.read_parquet(f"{Path(path)}/**/*.parquet", hive_partitioning=True)
+    return con.read_parquet(str(path))
+
+
+def _row_group_may_match(stats: dict, filters: dict) -> bool:
+    # Mirrors apply_dashboard_filters; a row group is skipped only when its
+    # min/max statistics prove no row can pass one of the filters
+    def may_equal(column, values):
+        if column not in stats:
+            return True
+        low, high = stats[column]
+        return any(low <= value <= high for value in values)
+
+    def may_overlap(column, low, high):
+        if column not in stats:
+            return True
+        return stats[column][0] <= high and low <= stats[column][1]
+
+    checks = [may_equal("Academic_Level", ["Undergraduate", "Graduate"])]
+    if filters.get("gender", "All") != "All":
+        checks.append(may_equal("Gender", [filters["gender"]]))
+    checks.append(may_overlap("Age", *filters.get("age_range", (0, 100))))
+    if filters.get("academic_level", "All") != "All":
+        checks.append(may_equal("Academic_Level", [filters["academic_level"]]))
+    if filters.get("countries"):
+        checks.append(may_equal("Country", filters["countries"]))
+    if filters.get("platforms"):
+        checks.append(may_equal("Most_Used_Platform", filters["platforms"]))
+    if filters.get("clicked_country") is not None:
+        checks.append(may_equal("Country", [filters["clicked_country"]]))
+    return all(checks)
+
+
+def row_groups_to_read(parquet_path: str | Path, **filters) -> tuple[int, int, int, int]:
+    """
+    How many row groups a dashboard filter cannot skip using min/max statistics.
+
+    Takes the same keyword filters as `apply_dashboard_filters`. Columns
+    without statistics never allow a skip, as in DuckDB.
+
+    Returns
+    -------
+    tuple of int
+        (row groups read, row groups in total, rows read, rows in total)
+    """
+    metadata = pq.ParquetFile(parquet_path).metadata
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    groups_read = rows_read = 0
+    for index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(index)
+        stats = {}
+        for i, name in enumerate(names):
+            column_stats = row_group.column(i).statistics
+            if column_stats is not None and column_stats.has_min_max:
+                stats[name] = (column_stats.min, column_stats.max)
+        if _row_group_may_match(stats, filters):
+            groups_read += 1
+            rows_read += row_group.num_rows
+    return groups_read, metadata.num_row_groups, rows_read, metadata.num_rows
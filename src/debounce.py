@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+from shiny import reactive
+
+_UNSET = object()
+
+
+class Debouncer:
+    """
+    Coalesces a burst of changing values into the last one.
+
+    Each `offer` restarts a quiet window; once `quiet_seconds` pass without
+    another offer, `settle` hands back the latest value. A burst that ends
+    where it started (a box ticked and unticked) settles to no change at
+    all. The very first value settles at once, so the first render is not
+    delayed.
+
+    Parameters
+    ----------
+    quiet_seconds : float
+        How long the value must stay unchanged before it settles.
+    clock : callable, default=time.monotonic
+        Returns the current time in seconds.
+
+    Attributes
+    ----------
+    changes : int
+        Values offered.
+    recomputes : int
+        Settled values that differed from the previous settled value, i.e.
+        the computations actually triggered.
+    """
+
+    def __init__(self, quiet_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.quiet_seconds = quiet_seconds
+        self.clock = clock
+        self.changes = 0
+        self.recomputes = 0
+        self._pending = _UNSET
+        self._settled = _UNSET
+        self._deadline = 0.0
+        self._burst = 0
+
+    @property
+    def saved(self) -> int:
+        """
+        Changes that did not trigger a computation of their own.
+        """
+        return self.changes - self.recomputes - self._burst
+
+    def offer(self, value: Any) -> float:
+        """
+        Record a new value; returns the time at which it settles if nothing follows.
+        """
+        self.changes += 1
+        self._burst += 1
+        self._pending = value
+        now = self.clock()
+        self._deadline = now if self._settled is _UNSET else now + self.quiet_seconds
+        return self._deadline
+
+    def wait(self) -> float | None:
+        """
+        Seconds until the pending value settles (0 when due), or None if nothing is pending.
+        """
+        if self._pending is _UNSET:
+            return None
+        return max(0.0, self._deadline - self.clock())
+
+    def settle(self) -> tuple[bool, Any, int]:
+        """
+        Take the pending value.
+
+        Returns
+        -------
+        tuple
+            (whether it differs from the last settled value, the value,
+            how many changes in the burst were coalesced away)
+        """
+        value, self._pending = self._pending, _UNSET
+        changed = self._settled is _UNSET or value != self._settled
+        if changed:
+            self._settled = value
+            self.recomputes += 1
+        burst, self._burst = self._burst, 0
+        return changed, value, burst - changed
+
+
+def debounced(source: Callable[[], Any], quiet_seconds: float, registry=None, name: str = "filters"):
+    """
+    A reactive calc that follows `source` once it has been quiet for `quiet_seconds`.
+
+    Dependents of the returned calc are invalidated only by settled values,
+    so a burst of input events costs one recomputation. Values are compared
+    with `==`, so `source` should return plain data such as a dict of input
+    values. Called from a server function; the settling is driven by
+    `reactive.invalidate_later`.
+
+    Parameters
+    ----------
+    source : callable
+        A reactive calc (or function reading inputs).
+    quiet_seconds : float
+        Debounce window; 0 or less returns `source` unchanged.
+    registry : MetricsRegistry, optional
+        Receives "changes", "recomputes" and "saved" counts under `name`.
+    name : str, default="filters"
+        Label of the counters.
+    """
+    if quiet_seconds <= 0:
+        return source
+
+    debouncer = Debouncer(quiet_seconds)
+    deadline = reactive.value(None)
+    settled = reactive.value()
+
+    @reactive.effect
+    def _offer():
+        value = source()
+        if registry is not None:
+            registry.count(name, "changes")
+        # Each offer has a later deadline, so _settle always re-runs
+        deadline.set(debouncer.offer(value))
+
+    @reactive.effect
+    def _settle():
+        if deadline.get() is None:
+            return
+        wait = debouncer.wait()
+        if wait is None:
+            return
+        if wait > 0:
+            reactive.invalidate_later(wait)
+            return
+        changed, value, saved = debouncer.settle()
+        if registry is not None:
+            registry.count(name, "recomputes", int(changed))
+            registry.count(name, "saved", saved)
+        if changed:
+            settled.set(value)
+
+    @reactive.calc
+    def value():
+        return settled.get()
+
+    return value
@@ -1,19 +1,225 @@
+"""
+Download the student dataset into data/raw/ through content-addressed snapshots.
+
+Run from the project root:
+    python src/download_data.py                          # from Kaggle
+    python src/download_data.py --from-dir path/to/csvs  # from a local directory
+
+Every dataset version is stored once as an immutable snapshot under
+data/snapshots/: files are kept by their SHA-256 in objects/, and each
+version's file list in <snapshot id>.json. data/raw/ is then updated from
+the snapshot, copying only files whose hash changed. data/raw/.manifest.json
+records hashes, sizes and modification times so unchanged files are
+neither re-hashed nor copied again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
 import os
 import shutil
-import kagglehub
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+RAW_DIR = ROOT / "data" / "raw"
+SNAPSHOT_DIR = ROOT / "data" / "snapshots"
+MANIFEST_NAME = ".manifest.json"
+
+DATASET_HANDLE = "zahranusratt/student-social-media-addiction-analysis-dataset"
+
+
+class KaggleSource:
+    """
+    Dataset files downloaded (and cached) by kagglehub.
+    """
+
+    def __init__(self, handle: str = DATASET_HANDLE):
+        self.handle = handle
+
+    def fetch(self) -> Path:
+        import kagglehub
+
+        return Path(kagglehub.dataset_download(self.handle))
+
+    def __str__(self) -> str:
+        return f"kaggle:{self.handle}"
+
+
+class LocalSource:
+    """
+    Dataset files already in a local directory, e.g. a manual download or test fixture.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def fetch(self) -> Path:
+        if not self.path.is_dir():
+            raise FileNotFoundError(f"Dataset directory not found: {self.path}")
+        return self.path
+
+    def __str__(self) -> str:
+        return f"dir:{self.path}"
+
+
+def file_sha256(path: str | Path, chunk_bytes: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_bytes):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_files(directory: Path, known: dict | None = None) -> dict[str, dict]:
+    """
+    Hash, size and modification time of every file under `directory`.
+
+    A file whose size and modification time match its entry in `known` keeps
+    the recorded hash instead of being read again. Hidden files are skipped.
+    """
+    known = known or {}
+    files = {}
+    for path in sorted(directory.rglob("*")):
+        relative = path.relative_to(directory).as_posix()
+        if not path.is_file() or any(part.startswith(".") for part in relative.split("/")):
+            continue
+        stat = path.stat()
+        entry = known.get(relative)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            sha256 = entry["sha256"]
+        else:
+            sha256 = file_sha256(path)
+        files[relative] = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return files
+
+
+def snapshot_id(files: dict[str, dict]) -> str:
+    """
+    Content address of a dataset version: the hash of its file names, hashes and sizes.
+    """
+    listing = {name: {"sha256": f["sha256"], "size": f["size"]} for name, f in sorted(files.items())}
+    return hashlib.sha256(json.dumps(listing, sort_keys=True).encode()).hexdigest()
+
+
+def _object_path(store: Path, sha256: str) -> Path:
+    return store / "objects" / sha256[:2] / sha256
+
+
+def store_snapshot(source_dir: Path, files: dict[str, dict], store: Path = SNAPSHOT_DIR) -> str:
+    """
+    Add a dataset version to the snapshot store and return its id.
+
+    Files already stored under their hash are not copied again. Stored
+    objects and snapshot listings are made read-only and never rewritten.
+    """
+    for name, entry in files.items():
+        target = _object_path(store, entry["sha256"])
+        if target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_suffix(".partial")
+        shutil.copyfile(source_dir / name, partial)
+        if file_sha256(partial) != entry["sha256"]:
+            partial.unlink()
+            raise RuntimeError(f"{name} changed while it was being stored; run the download again.")
+        os.chmod(partial, 0o444)
+        partial.replace(target)
+
+    version = snapshot_id(files)
+    listing = store / f"{version}.json"
+    if not listing.exists():
+        listing.write_text(json.dumps(
+            {name: {"sha256": f["sha256"], "size": f["size"]} for name, f in sorted(files.items())}, indent=2
+        ) + "\n")
+        os.chmod(listing, 0o444)
+    return version
+
+
+def checkout_snapshot(version: str, raw_dir: Path = RAW_DIR, store: Path = SNAPSHOT_DIR) -> tuple[list[str], list[str]]:
+    """
+    Make `raw_dir` hold exactly the files of snapshot `version`.
+
+    Files whose size and modification time still match the manifest, and
+    whose hash equals the snapshot's, are left alone. Files that the previous
+    snapshot put in `raw_dir` but `version` does not have are removed.
+
+    Returns
+    -------
+    tuple of list of str
+        (files copied, files left unchanged)
+    """
+    listing = json.loads((store / f"{version}.json").read_text())
+    manifest_path = raw_dir / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    present = scan_files(raw_dir, manifest.get("files"))
+
+    copied, unchanged = [], []
+    for name, entry in listing.items():
+        if present.get(name, {}).get("sha256") == entry["sha256"]:
+            unchanged.append(name)
+            continue
+        target = raw_dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(_object_path(store, entry["sha256"]), target)
+        copied.append(name)
+
+    for name in manifest.get("files", {}):
+        if name not in listing and (raw_dir / name).exists():
+            (raw_dir / name).unlink()
+
+    files = {name: f for name, f in scan_files(raw_dir, present).items() if name in listing}
+    manifest_path.write_text(json.dumps({"snapshot": version, "files": files}, indent=2) + "\n")
+    return copied, unchanged
+
+
+def download_data(source=None, raw_dir: Path = RAW_DIR, store: Path = SNAPSHOT_DIR) -> str:
+    """
+    Fetch the dataset from `source` (Kaggle by default) into `raw_dir` via a snapshot.
+
+    Parameters
+    ----------
+    source : KaggleSource | LocalSource, optional
+        Anything with a `fetch()` method returning a directory of dataset files.
+    raw_dir : Path
+        Working copy that prep_data.py reads.
+    store : Path
+        Snapshot store.
+
+    Returns
+    -------
+    str
+        The snapshot id of the version now in `raw_dir`.
+    """
+    source = source or KaggleSource()
+    print(f"Fetching {source}...")
+    source_dir = source.fetch()
+
+    # Hashes of the source files from the last run, reused while unchanged
+    known_path = store / "sources.json"
+    known = json.loads(known_path.read_text()) if known_path.exists() else {}
+    files = scan_files(source_dir, known.get(str(source_dir)))
+    store.mkdir(parents=True, exist_ok=True)
+    known[str(source_dir)] = files
+    known_path.write_text(json.dumps(known, indent=2) + "\n")
+
+    version = store_snapshot(source_dir, files, store)
+    copied, unchanged = checkout_snapshot(version, raw_dir, store)
+    print(f"Snapshot {version[:12]}: {len(copied)} file(s) copied to {raw_dir}, {len(unchanged)} unchanged.")
+    return version
+
 
-def download_data():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, '../data/raw/')
-    os.makedirs(data_dir, exist_ok=True)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--from-dir", type=Path, default=None, help="Use a local directory instead of Kaggle.")
+    args = parser.parse_args()
+    download_data(LocalSource(args.from_dir) if args.from_dir else KaggleSource())
 
-    print("Downloading to cache...")
-    cached_path = kagglehub.dataset_download("zahranusratt/student-social-media-addiction-analysis-dataset")
-    
-    print(f"Copying data to {data_dir}...")
-    shutil.copytree(cached_path, data_dir, dirs_exist_ok=True)
 
-    print("Done.")
-        
 if __name__ == "__main__":
-    download_data()
+    main()
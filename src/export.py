@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import io
+from typing import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .logic import portable_dtypes
+
+EXPORT_FORMATS = {
+    "csv": "CSV",
+    "parquet": "Parquet",
+    "arrow": "Arrow IPC",
+}
+
+EXPORT_EXTENSIONS = {
+    "csv": "csv",
+    "parquet": "parquet",
+    "arrow": "arrows",
+}
+
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object whose contents are drained after every chunk.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.extend(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Serialise `df` to CSV in fixed-size row chunks.
+
+    The header is sent with the first chunk, so the output is identical to
+    `df.to_csv(index=False)` while only one chunk is held in memory.
+    """
+    if df.empty:
+        yield df.to_csv(index=False)
+        return
+
+    for i, chunk in enumerate(_chunks(df, chunk_rows)):
+        yield chunk.to_csv(index=False, header=(i == 0))
+
+
+def iter_parquet(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Serialise `df` to Parquet, one row group per chunk, yielding bytes as
+    each row group is written.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_arrow(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Serialise `df` to the Arrow IPC streaming format, one record batch per chunk.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_export(df: pd.DataFrame, fmt: str = "csv", chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Stream `df` in the requested export format.
+
+    Columns are exported as int64, float64 and plain strings whatever their
+    in-memory dtypes (see `portable_dtypes`), so download schemas are stable.
+
+    Parameters
+    ----------
+    fmt : str, default="csv"
+        One of the keys of `EXPORT_FORMATS`.
+
+    Returns
+    -------
+    Iterator[str] | Iterator[bytes]
+        Chunks ready to be sent to the browser as they are produced.
+    """
+    writers = {"csv": iter_csv, "parquet": iter_parquet, "arrow": iter_arrow}
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(writers)}.")
+    return writers[fmt](portable_dtypes(df), chunk_rows)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-import pycountry
+
+from .cache import is_refinement, normalize_filters
 
 
 def apply_dashboard_filters(
@@ -16,9 +20,13 @@ def apply_dashboard_filters(
     """
     Filter the dashboard dataset using the same rules as the app.
 
+    When `df` is an ibis table the filters are not evaluated; an unexecuted
+    ibis expression is returned instead so the database can run the
+    downstream aggregations (pushdown mode).
+
     Parameters
     ----------
-    df : pd.DataFrame
+    df : pd.DataFrame | ibis.Table
         Full student dataset.
     gender : str, default="All"
         "All", "Male", or "Female".
@@ -35,9 +43,14 @@ def apply_dashboard_filters(
 
     Returns
     -------
-    pd.DataFrame
-        Filtered dataframe.
+    pd.DataFrame | ibis.Table
+        Filtered dataframe, or filtered ibis expression.
     """
+    if not isinstance(df, pd.DataFrame):
+        return _filter_ibis_table(
+            df, gender, age_range, academic_level, countries, platforms, clicked_country
+        )
+
     result = df.copy()
 
     result = result[result["Academic_Level"].isin(["Undergraduate", "Graduate"])]
@@ -63,19 +76,494 @@ def apply_dashboard_filters(
     return result
 
 
+CATEGORICAL_COLUMNS = [
+    "Gender",
+    "Academic_Level",
+    "Country",
+    "Most_Used_Platform",
+    "Affects_Academic_Performance",
+    "Relationship_Status",
+    "iso_alpha",
+]
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the student table to its smallest safe in-memory representation.
+
+    Low-cardinality text columns become categoricals, integer columns are
+    downcast to the smallest integer type that holds their range, and float
+    columns become float32 only when every value survives the round trip
+    exactly (otherwise they stay float64 so displayed values never change).
+
+    Returns
+    -------
+    pd.DataFrame
+        A new dataframe with the same values and compact dtypes.
+    """
+    result = {}
+    for column in df.columns:
+        values = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            values = values.astype("category")
+        elif pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            narrow = values.astype("float32")
+            if np.array_equal(narrow.astype("float64"), values, equal_nan=True):
+                values = narrow
+        result[column] = values
+    return pd.DataFrame(result, index=df.index)
+
+
+def portable_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Undo `compact_dtypes` for data that leaves the dashboard.
+
+    SQL engines and file formats inherit a frame's dtypes, so QueryChat's
+    DuckDB table and user downloads get int64 integers, float64 floats and
+    plain string columns: arithmetic on an int8 column would overflow in
+    DuckDB, and exported schemas should not depend on the in-memory layout.
+
+    Returns
+    -------
+    pd.DataFrame
+        A new dataframe with the same values and the widest dtypes.
+    """
+    result = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        elif pd.api.types.is_integer_dtype(values) and not pd.api.types.is_extension_array_dtype(values):
+            values = values.astype("int64")
+        elif pd.api.types.is_float_dtype(values):
+            values = values.astype("float64")
+        result[column] = values
+    return pd.DataFrame(result, index=df.index)
+
+
+def portable_sql_types(df: pd.DataFrame) -> dict[str, str]:
+    """
+    The DuckDB types `portable_dtypes` would give each column.
+
+    Lets a SQL view cast the compact frame as it is queried, instead of
+    materialising a widened copy.
+
+    Returns
+    -------
+    dict
+        Column name to BIGINT, DOUBLE or VARCHAR for every numeric and
+        categorical column; other columns need no cast.
+    """
+    types = {}
+    for column, dtype in df.dtypes.items():
+        categorical = isinstance(dtype, pd.CategoricalDtype)
+        if categorical:
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+            types[column] = "BIGINT"
+        elif pd.api.types.is_float_dtype(dtype):
+            types[column] = "DOUBLE"
+        elif categorical:
+            types[column] = "VARCHAR"
+    return types
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """
+    Resident size of a dataframe in bytes, including string contents.
+    """
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _filter_ibis_table(table, gender, age_range, academic_level, countries, platforms, clicked_country):
+    """
+    Build the ibis equivalent of `apply_dashboard_filters` without executing it.
+    """
+    predicates = [table.Academic_Level.isin(["Undergraduate", "Graduate"])]
+
+    if gender != "All":
+        predicates.append(table.Gender == gender)
+
+    age_low, age_high = age_range
+    predicates.append(table.Age.between(int(age_low), int(age_high)))
+
+    if academic_level != "All":
+        predicates.append(table.Academic_Level == academic_level)
+
+    if countries:
+        predicates.append(table.Country.isin(list(countries)))
+
+    if platforms:
+        predicates.append(table.Most_Used_Platform.isin(list(platforms)))
+
+    if clicked_country is not None:
+        predicates.append(table.Country == clicked_country)
+
+    return table.filter(predicates)
+
+
+class DashboardFilterIndex:
+    """
+    Precomputed bitmap index answering the dashboard filter signature.
+
+    One bitmap (a bit-packed boolean mask, one bit per row) is built per
+    distinct Gender, Academic_Level, Country and Most_Used_Platform value,
+    plus a stable sort of the Age column. A query ANDs the relevant bitmaps
+    and returns row positions into the indexed frame,
+    so no intermediate DataFrames are materialised. `apply_dashboard_filters`
+    remains the reference implementation and the two must agree row-for-row.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Full student dataset. It is kept by reference, not copied.
+    """
+
+    INDEXED_COLUMNS = ("Gender", "Academic_Level", "Country", "Most_Used_Platform")
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n_rows = len(df)
+
+        self._masks = {}
+        self._codes = {}
+        self._code_of = {}
+        for column in self.INDEXED_COLUMNS:
+            codes, uniques = pd.factorize(df[column])
+            codes = pd.to_numeric(codes, downcast="integer")
+            self._codes[column] = codes
+            self._code_of[column] = {value: code for code, value in enumerate(uniques)}
+            self._masks[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+
+        self._base_mask = self._any_of("Academic_Level", ["Undergraduate", "Graduate"])
+
+        self._ages = df["Age"].to_numpy()
+        order_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self._age_order = np.argsort(self._ages, kind="stable").astype(order_dtype)
+        self._sorted_ages = self._ages[self._age_order]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the precomputed masks, codes and age layout.
+        """
+        masks = sum(m.nbytes for column in self._masks.values() for m in column.values())
+        codes = sum(c.nbytes for c in self._codes.values())
+        return masks + codes + self._age_order.nbytes + self._sorted_ages.nbytes
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def _one_of(self, column: str, value) -> np.ndarray:
+        return self._masks[column].get(value, self._empty())
+
+    def _any_of(self, column: str, values) -> np.ndarray:
+        mask = self._empty()
+        for value in values:
+            mask |= self._one_of(column, value)
+        return mask
+
+    def _age_mask(self, age_low, age_high) -> np.ndarray:
+        start = np.searchsorted(self._sorted_ages, age_low, side="left")
+        stop = np.searchsorted(self._sorted_ages, age_high, side="right")
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self._age_order[start:stop]] = True
+        return np.packbits(mask)
+
+    def mask(
+        self,
+        gender: str = "All",
+        age_range: tuple[int, int] | list[int] = (0, 100),
+        academic_level: str = "All",
+        countries: list[str] | None = None,
+        platforms: list[str] | None = None,
+        clicked_country: str | None = None,
+    ) -> np.ndarray:
+        """
+        Boolean row mask for the given filters (same arguments as
+        `apply_dashboard_filters`).
+        """
+        result = self._base_mask.copy()
+
+        if gender != "All":
+            result &= self._one_of("Gender", gender)
+
+        age_low, age_high = age_range
+        result &= self._age_mask(age_low, age_high)
+
+        if academic_level != "All":
+            result &= self._one_of("Academic_Level", academic_level)
+
+        if countries:
+            result &= self._any_of("Country", countries)
+
+        if platforms:
+            result &= self._any_of("Most_Used_Platform", platforms)
+
+        if clicked_country is not None:
+            result &= self._one_of("Country", clicked_country)
+
+        return np.unpackbits(result, count=self.n_rows).view(bool)
+
+    def positions(self, **filters) -> np.ndarray:
+        """
+        Integer row positions (in original order) matching the filters.
+        """
+        return np.flatnonzero(self.mask(**filters))
+
+    def filter(self, **filters) -> pd.DataFrame:
+        """
+        Filtered dataframe, equivalent to `apply_dashboard_filters(df, **filters)`.
+        """
+        return self.df.iloc[self.positions(**filters)]
+
+    def _subset_in(self, column: str, values, positions: np.ndarray) -> np.ndarray:
+        wanted = [self._code_of[column][v] for v in values if v in self._code_of[column]]
+        return np.isin(self._codes[column][positions], wanted)
+
+    def refine(
+        self,
+        positions: np.ndarray,
+        gender: str = "All",
+        age_range: tuple[int, int] | list[int] = (0, 100),
+        academic_level: str = "All",
+        countries: list[str] | None = None,
+        platforms: list[str] | None = None,
+        clicked_country: str | None = None,
+    ) -> np.ndarray:
+        """
+        Keep the rows of an earlier query result that match the filters.
+
+        Only the given positions are examined, so the cost is proportional to
+        the previous result rather than the whole dataset. `positions` must
+        come from `positions()` or `refine()` on this index.
+        """
+        keep = np.ones(len(positions), dtype=bool)
+
+        if gender != "All":
+            keep &= self._subset_in("Gender", [gender], positions)
+
+        age_low, age_high = age_range
+        ages = self._ages[positions]
+        keep &= (ages >= age_low) & (ages <= age_high)
+
+        if academic_level != "All":
+            keep &= self._subset_in("Academic_Level", [academic_level], positions)
+
+        if countries:
+            keep &= self._subset_in("Country", countries, positions)
+
+        if platforms:
+            keep &= self._subset_in("Most_Used_Platform", platforms, positions)
+
+        if clicked_country is not None:
+            keep &= self._subset_in("Country", [clicked_country], positions)
+
+        return positions[keep]
+
+
+class IncrementalFilter:
+    """
+    Per-session filter that narrows its previous result when it can.
+
+    When the new filter state is a refinement of the last one (see
+    `is_refinement`), only the previous result is filtered; otherwise, for
+    example when a filter widens, the full index is queried again.
+
+    Parameters
+    ----------
+    index : DashboardFilterIndex
+        Shared index over the full dataset.
+    """
+
+    def __init__(self, index: DashboardFilterIndex):
+        self.index = index
+        self._key = None
+        self._positions = None
+        self.refinements = 0
+        self.full_scans = 0
+
+    def positions(self, **filters) -> np.ndarray:
+        """
+        Row positions matching the filters (same arguments as
+        `apply_dashboard_filters`).
+        """
+        key = normalize_filters(**filters)
+        if self._key is not None and is_refinement(self._key, key):
+            positions = self.index.refine(self._positions, **filters)
+            self.refinements += 1
+        else:
+            positions = self.index.positions(**filters)
+            self.full_scans += 1
+        self.remember(key, positions)
+        return positions
+
+    def remember(self, key: tuple, positions: np.ndarray) -> None:
+        """
+        Record a result computed elsewhere (e.g. taken from a shared cache)
+        as the starting point for the next refinement.
+        """
+        self._key = key
+        self._positions = positions
+
+
+CUBE_KEYS = [
+    "Gender",
+    "Academic_Level",
+    "Age",
+    "Country",
+    "Most_Used_Platform",
+    "Affects_Academic_Performance",
+]
+CUBE_MEASURES = ["Avg_Daily_Usage_Hours", "Sleep_Hours_Per_Night", "Addicted_Score"]
+CELL_VALUES = ["Count", *(f"{m}_{stat}" for m in CUBE_MEASURES for stat in ("sum", "n"))]
+
+
+def build_cells(df, keys: list[str]) -> pd.DataFrame:
+    """
+    Group rows (or existing cells) by `keys` into count/sum cells.
+
+    Accepts a pandas dataframe, an ibis table (grouped inside the database)
+    or a `CubeSelection` (its cells are rolled up to the coarser keys).
+
+    Returns
+    -------
+    pd.DataFrame
+        The key columns plus "Count" and, per measure in `CUBE_MEASURES`,
+        "<measure>_sum" and "<measure>_n" (non-null count).
+    """
+    if isinstance(df, CubeSelection):
+        return (
+            df.cells.groupby(keys, observed=True, dropna=False)[CELL_VALUES]
+            .sum()
+            .reset_index()
+        )
+
+    if not isinstance(df, pd.DataFrame):
+        aggregates = {"Count": df.count()}
+        for measure in CUBE_MEASURES:
+            aggregates[f"{measure}_sum"] = df[measure].sum()
+            aggregates[f"{measure}_n"] = df[measure].count()
+        return df.group_by(keys).aggregate(**aggregates).execute()
+
+    grouped = df.groupby(keys, observed=True, dropna=False)
+    cells = grouped.size().to_frame("Count")
+    for measure in CUBE_MEASURES:
+        cells[f"{measure}_sum"] = grouped[measure].sum()
+        cells[f"{measure}_n"] = grouped[measure].count()
+    return cells.reset_index()
+
+
+class CubeSelection:
+    """
+    Cube cells matching one filter state.
+
+    `summarize_stat_tiles`, `count_by`, `summarize_country_metrics` and
+    `group_platforms_for_sunburst` accept a selection in place of row-level
+    data and answer by summing cells.
+    """
+
+    def __init__(self, cells: pd.DataFrame):
+        self.cells = cells
+
+    def _means(self, grouped) -> pd.DataFrame:
+        out = grouped["Count"].sum().to_frame()
+        for measure in CUBE_MEASURES:
+            total = grouped[f"{measure}_sum"].sum()
+            n = grouped[f"{measure}_n"].sum()
+            out[measure] = (total / n.where(n > 0)).astype(float)
+        return out
+
+    def stat_tiles(self) -> dict:
+        cells = self.cells
+        tiles = {"Students": int(cells["Count"].sum())}
+        for measure in CUBE_MEASURES:
+            n = cells[f"{measure}_n"].sum()
+            tiles[measure] = float(cells[f"{measure}_sum"].sum() / n) if n else float("nan")
+        return tiles
+
+    def count_by(self, columns: list[str]) -> pd.DataFrame:
+        return (
+            self.cells.groupby(columns, observed=True)["Count"]
+            .sum()
+            .reset_index()
+        )
+
+    def country_metrics(self, keys: list[str]) -> pd.DataFrame:
+        grouped = self.cells.groupby(keys, observed=True, dropna=False)
+        out = self._means(grouped).rename(columns={"Count": "Student_ID"})
+        return out.reset_index()
+
+
+class DashboardCube:
+    """
+    Precomputed counts and sums keyed by `CUBE_KEYS`.
+
+    Built once at load time from a pandas dataframe or an ibis table (in
+    which case DuckDB builds the cells). Queries take the
+    `apply_dashboard_filters` arguments and return a `CubeSelection`, so the
+    cost of a filter change depends on the number of distinct segments rather
+    than the number of students.
+
+    Parameters
+    ----------
+    df : pd.DataFrame | ibis.Table
+        Full student dataset.
+    """
+
+    def __init__(self, df):
+        keys = CUBE_KEYS + (["iso_alpha"] if "iso_alpha" in df.columns else [])
+        self.cells = build_cells(df, keys)
+        self._index = DashboardFilterIndex(self.cells)
+
+    def query(self, **filters) -> CubeSelection:
+        """
+        Select the cells matching the filters (same arguments as
+        `apply_dashboard_filters`).
+        """
+        return CubeSelection(self._index.filter(**filters))
+
+
 def summarize_country_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate country-level metrics for the map.
 
+    Accepts a pandas dataframe, an ibis table (aggregated inside the database)
+    or a `CubeSelection`. When the data carries the precomputed `iso_alpha`
+    column (written by `data/prep_data.py`) it is kept alongside Country.
+
     Returns
     -------
     pd.DataFrame
         One row per country with count and averages.
     """
+    if isinstance(df, CubeSelection):
+        keys = ["Country", "iso_alpha"] if "iso_alpha" in df.cells.columns else ["Country"]
+        return df.country_metrics(keys)
+
+    keys = ["Country", "iso_alpha"] if "iso_alpha" in df.columns else ["Country"]
+
+    if not isinstance(df, pd.DataFrame):
+        return (
+            df.group_by(keys)
+            .aggregate(
+                Student_ID=df.Student_ID.count(),
+                Avg_Daily_Usage_Hours=df.Avg_Daily_Usage_Hours.mean(),
+                Sleep_Hours_Per_Night=df.Sleep_Hours_Per_Night.mean(),
+                Addicted_Score=df.Addicted_Score.mean(),
+            )
+            .order_by("Country")
+            .execute()
+        )
+
     if df.empty:
         return pd.DataFrame(
             columns=[
-                "Country",
+                *keys,
                 "Student_ID",
                 "Avg_Daily_Usage_Hours",
                 "Sleep_Hours_Per_Night",
@@ -84,7 +572,7 @@ def summarize_country_metrics(df: pd.DataFrame) -> pd.DataFrame:
         )
 
     return (
-        df.groupby("Country", as_index=False)
+        df.groupby(keys, as_index=False, observed=True, dropna=False)
         .agg(
             Student_ID=("Student_ID", "count"),
             Avg_Daily_Usage_Hours=("Avg_Daily_Usage_Hours", "mean"),
@@ -94,23 +582,90 @@ def summarize_country_metrics(df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
+def summarize_stat_tiles(df) -> dict:
+    """
+    Compute the four stat-tile values in one query.
+
+    Accepts a pandas dataframe, an ibis table (the aggregation runs inside
+    the database and only one row comes back) or a `CubeSelection`.
+
+    Returns
+    -------
+    dict
+        Keys "Students", "Avg_Daily_Usage_Hours", "Sleep_Hours_Per_Night"
+        and "Addicted_Score". Averages are NaN when there are no rows.
+    """
+    if isinstance(df, CubeSelection):
+        return df.stat_tiles()
+
+    if not isinstance(df, pd.DataFrame):
+        row = df.aggregate(
+            Students=df.count(),
+            Avg_Daily_Usage_Hours=df.Avg_Daily_Usage_Hours.mean(),
+            Sleep_Hours_Per_Night=df.Sleep_Hours_Per_Night.mean(),
+            Addicted_Score=df.Addicted_Score.mean(),
+        ).execute().iloc[0]
+        return {
+            "Students": int(row["Students"]),
+            "Avg_Daily_Usage_Hours": float(pd.to_numeric(row["Avg_Daily_Usage_Hours"])),
+            "Sleep_Hours_Per_Night": float(pd.to_numeric(row["Sleep_Hours_Per_Night"])),
+            "Addicted_Score": float(pd.to_numeric(row["Addicted_Score"])),
+        }
+
+    return {
+        "Students": len(df),
+        "Avg_Daily_Usage_Hours": float(df["Avg_Daily_Usage_Hours"].mean()),
+        "Sleep_Hours_Per_Night": float(df["Sleep_Hours_Per_Night"].mean()),
+        "Addicted_Score": float(df["Addicted_Score"].mean()),
+    }
+
+
+def count_by(df, columns: list[str]) -> pd.DataFrame:
+    """
+    Count students per combination of `columns`.
+
+    Accepts a pandas dataframe, an ibis table (counted inside the database)
+    or a `CubeSelection`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The group columns plus a "Count" column, sorted by the group columns.
+    """
+    if isinstance(df, CubeSelection):
+        return df.count_by(columns)
+
+    if not isinstance(df, pd.DataFrame):
+        return df.group_by(columns).aggregate(Count=df.count()).order_by(columns).execute()
+
+    return df.groupby(columns, observed=True).size().reset_index(name="Count")
+
+
+def select_columns(df, columns: list[str]) -> pd.DataFrame:
+    """
+    Return only `columns` as a pandas dataframe, executing ibis tables.
+    """
+    if not isinstance(df, pd.DataFrame):
+        return df.select(columns).execute()
+
+    return df[columns]
+
+
 def group_platforms_for_sunburst(df: pd.DataFrame, top_n: int = 6) -> pd.DataFrame:
     """
     Keep the top-N platforms and group the rest into 'Other'.
 
+    Accepts a pandas dataframe, an ibis table or a `CubeSelection`.
+
     Returns
     -------
     pd.DataFrame
         Aggregated platform counts by gender with Platform_Group column.
     """
-    if df.empty:
-        return pd.DataFrame(columns=["Gender", "Most_Used_Platform", "Count", "Platform_Group"])
+    platform_counts = count_by(df, ["Gender", "Most_Used_Platform"])
 
-    platform_counts = (
-        df.groupby(["Gender", "Most_Used_Platform"])
-        .size()
-        .reset_index(name="Count")
-    )
+    if platform_counts.empty:
+        return pd.DataFrame(columns=["Gender", "Most_Used_Platform", "Count", "Platform_Group"])
 
     top_platforms = (
         platform_counts.groupby("Most_Used_Platform")["Count"]
@@ -126,11 +681,120 @@ def group_platforms_for_sunburst(df: pd.DataFrame, top_n: int = 6) -> pd.DataFra
     return platform_counts
 
 
+def bin_scatter(
+    df,
+    x: str = "Addicted_Score",
+    y: str = "Mental_Health_Score",
+    color: str = "Sleep_Hours_Per_Night",
+    bin_width: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Bin a scatter into a 2D grid on the server.
+
+    Each (x, y) cell carries its student count and the mean of `color`, so
+    the chart payload depends on the number of occupied cells rather than
+    the number of rows. Accepts a pandas dataframe or an ibis table (binned
+    inside the database).
+
+    Parameters
+    ----------
+    bin_width : float, default=1.0
+        Width of a bin on both axes. Bins are labelled by their lower edge,
+        so with the default width integer scores keep their own value.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns `x`, `y`, "Count" and `color` (the mean), one row per occupied bin.
+    """
+    if not isinstance(df, pd.DataFrame):
+        binned = df.mutate(
+            _x=(df[x] / bin_width).floor().cast("float64") * bin_width,
+            _y=(df[y] / bin_width).floor().cast("float64") * bin_width,
+        )
+        return (
+            binned.group_by(["_x", "_y"])
+            .aggregate(Count=binned.count(), _color=binned[color].mean())
+            .rename({x: "_x", y: "_y", color: "_color"})
+            .order_by([x, y])
+            .execute()
+        )
+
+    binned = pd.DataFrame(
+        {
+            x: np.floor(df[x].to_numpy(dtype=float) / bin_width) * bin_width,
+            y: np.floor(df[y].to_numpy(dtype=float) / bin_width) * bin_width,
+            color: df[color].to_numpy(dtype=float),
+        }
+    )
+    return (
+        binned.groupby([x, y])
+        .agg(Count=(color, "size"), **{color: (color, "mean")})
+        .reset_index()
+    )
+
+
+SUMMARY_KEYS = [
+    "Gender",
+    "Academic_Level",
+    "Country",
+    "Most_Used_Platform",
+    "Affects_Academic_Performance",
+]
+
+
+@dataclass(frozen=True)
+class DashboardSummary:
+    """
+    Every aggregate the dashboard tab renders for one filter state.
+    """
+
+    tiles: dict
+    academic_performance: pd.DataFrame
+    academic_level: pd.DataFrame
+    level_gender: pd.DataFrame
+    platforms: pd.DataFrame
+    countries: pd.DataFrame
+
+
+def summarize_dashboard(df) -> DashboardSummary:
+    """
+    Compute all dashboard aggregates from one grouped pass over the data.
+
+    The rows are grouped once into segments keyed by `SUMMARY_KEYS` (plus
+    `iso_alpha` when present); the tiles, chart counts, sunburst groups and
+    country metrics are then derived from those few segments instead of
+    each renderer walking the filtered rows again.
+
+    Accepts a pandas dataframe, an ibis table (the single pass runs inside
+    the database) or a `CubeSelection`.
+
+    Returns
+    -------
+    DashboardSummary
+    """
+    columns = df.cells.columns if isinstance(df, CubeSelection) else df.columns
+    keys = SUMMARY_KEYS + (["iso_alpha"] if "iso_alpha" in columns else [])
+    segments = CubeSelection(build_cells(df, keys))
+
+    return DashboardSummary(
+        tiles=summarize_stat_tiles(segments),
+        academic_performance=count_by(segments, ["Affects_Academic_Performance"]),
+        academic_level=count_by(segments, ["Academic_Level"]),
+        level_gender=count_by(segments, ["Academic_Level", "Gender"]),
+        platforms=group_platforms_for_sunburst(segments),
+        countries=summarize_country_metrics(segments),
+    )
+
+
 def get_iso3(country_name: str) -> str | None:
     """
     Convert a country name to ISO-3 code for the choropleth map.
     Returns None when the country cannot be matched.
     """
+    # Only prep_data.py resolves names, so the app never loads pycountry's tables
+    import pycountry
+
     try:
         return pycountry.countries.search_fuzzy(country_name)[0].alpha_3
     except Exception:
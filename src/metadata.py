@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from .dataset import read_students
+
+METADATA_VERSION = 1
+
+
+def sidecar_path(parquet_path: str | Path) -> Path:
+    """
+    Where the metadata of `parquet_path` (a file or partitioned dataset
+    directory) is stored: `<name>.meta.json` beside it.
+    """
+    parquet_path = Path(parquet_path)
+    return parquet_path.with_name(f"{parquet_path.stem}.meta.json")
+
+
+def _hash_footer(digest, parquet_file: Path) -> None:
+    with open(parquet_file, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(size - 8)
+        footer_length = int.from_bytes(f.read(4), "little")
+        f.seek(size - 8 - footer_length)
+        footer = f.read(footer_length)
+    digest.update(size.to_bytes(8, "little"))
+    digest.update(footer)
+
+
+def parquet_content_hash(parquet_path: str | Path) -> str:
+    """
+    Hash identifying the contents of a Parquet file, read in constant time.
+
+    Covers the file size and the Parquet footer, which records the row
+    count and every column chunk's offset, compressed size and min/max
+    statistics, so rewriting the file with other data changes the hash.
+    Only the footer is read, however many rows the file holds. For a
+    partitioned dataset directory, every file's relative path and footer
+    are hashed, so appending a batch changes the hash too.
+    """
+    parquet_path = Path(parquet_path)
+    digest = hashlib.blake2b(digest_size=16)
+    if not parquet_path.is_dir():
+        _hash_footer(digest, parquet_path)
+        return digest.hexdigest()
+
+    for parquet_file in sorted(parquet_path.rglob("*.parquet")):
+        digest.update(parquet_file.relative_to(parquet_path).as_posix().encode())
+        _hash_footer(digest, parquet_file)
+    return digest.hexdigest()
+
+
+def _plain(value):
+    # numpy scalars and missing values as JSON-friendly Python objects
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def dataset_metadata(df: pd.DataFrame) -> dict:
+    """
+    Row count, value ranges and distinct values of a student table.
+
+    Numeric columns get their min and max; every other column its distinct
+    values with their counts, sorted by value with missing values last.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The processed student table.
+
+    Returns
+    -------
+    dict
+        {"row_count": int, "ranges": {column: [min, max]},
+        "values": {column: {"values": [...], "counts": [...]}}}
+    """
+    ranges = {}
+    values = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            ranges[column] = [_plain(series.min()), _plain(series.max())]
+            continue
+        counts = series.value_counts(dropna=False, sort=False)
+        counts = counts.loc[sorted(counts.index, key=lambda v: (pd.isna(v), "" if pd.isna(v) else str(v)))]
+        values[column] = {
+            "values": [_plain(v) for v in counts.index],
+            "counts": [int(n) for n in counts.to_numpy()],
+        }
+    return {"row_count": len(df), "ranges": ranges, "values": values}
+
+
+def merge_metadata(first: dict, second: dict) -> dict:
+    """
+    Metadata of two tables stacked on top of each other.
+
+    Lets an appended batch update a dataset's sidecar without scanning the
+    rows already there.
+    """
+    ranges = {}
+    for column in dict.fromkeys([*first["ranges"], *second["ranges"]]):
+        bounds = [b for b in (first["ranges"].get(column), second["ranges"].get(column)) if b]
+        ranges[column] = [min(b[0] for b in bounds), max(b[1] for b in bounds)]
+
+    values = {}
+    for column in dict.fromkeys([*first["values"], *second["values"]]):
+        counts = {}
+        for part in (first["values"].get(column), second["values"].get(column)):
+            for value, count in zip(*part.values()) if part else ():
+                counts[value] = counts.get(value, 0) + count
+        ordered = sorted(counts, key=lambda v: (v is None, "" if v is None else str(v)))
+        values[column] = {"values": ordered, "counts": [counts[v] for v in ordered]}
+
+    return {
+        "row_count": first["row_count"] + second["row_count"],
+        "ranges": ranges,
+        "values": values,
+    }
+
+
+def save_metadata(parquet_path: str | Path, metadata: dict, provenance: dict | None = None) -> Path:
+    """
+    Write `metadata` as the sidecar of `parquet_path`, stamped with its current content hash.
+
+    `provenance` records what the file was built from (e.g. the raw CSV's
+    hash and the layout), so prep_data.py can tell when a rebuild is needed.
+    """
+    stamped = {
+        "version": METADATA_VERSION,
+        "content_hash": parquet_content_hash(parquet_path),
+        **{key: metadata[key] for key in ("row_count", "ranges", "values")},
+    }
+    if provenance is not None:
+        stamped["provenance"] = provenance
+    path = sidecar_path(parquet_path)
+    path.write_text(json.dumps(stamped, indent=2) + "\n")
+    return path
+
+
+def write_metadata(parquet_path: str | Path, df: pd.DataFrame | None = None, provenance: dict | None = None) -> Path:
+    """
+    Write the metadata sidecar of a Parquet file or partitioned dataset.
+
+    Parameters
+    ----------
+    parquet_path : str | Path
+        The Parquet file or dataset directory to describe.
+    df : pd.DataFrame, optional
+        Its contents, if already loaded; otherwise the data is read.
+    provenance : dict, optional
+        What the data was built from; see `save_metadata`.
+
+    Returns
+    -------
+    Path
+        The sidecar written.
+    """
+    if df is None:
+        df = read_students(parquet_path)
+    return save_metadata(parquet_path, dataset_metadata(df), provenance)
+
+
+def read_metadata(parquet_path: str | Path) -> dict | None:
+    """
+    Read the metadata sidecar of a Parquet file if it is still current.
+
+    Returns None when there is no sidecar, it was written by another
+    version of this module, or its content hash no longer matches the
+    file; callers then scan the data with `dataset_metadata` instead.
+    """
+    path = sidecar_path(parquet_path)
+    try:
+        metadata = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if metadata.get("version") != METADATA_VERSION:
+        return None
+    if metadata.get("content_hash") != parquet_content_hash(parquet_path):
+        return None
+    return metadata
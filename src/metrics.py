@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from typing import Any
+
+from shiny.render.renderer import Renderer
+
+# Histogram upper bounds in seconds, from a cached lookup to an LLM reply
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Output whose render is running, so bytes sent meanwhile are attributed to it
+_rendering_output: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "_rendering_output", default=None
+)
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe latency histograms, payload and debounce counters for dashboard outputs.
+
+    Each latency series is labelled with a name (the calc or output id) and a
+    kind: "calc", "render", "build" (a background figure-building stage) or
+    "llm". One instance is shared by every session in the worker process and
+    rendered in the Prometheus text format.
+
+    Parameters
+    ----------
+    buckets : tuple of float, default=LATENCY_BUCKETS
+        Histogram bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._payload_bytes: dict[str, int] = {}
+        self._debounce_counts: dict[tuple[str, str], int] = {}
+        # Widget model id -> output id, so widget messages sent outside a
+        # render (patches from effects) are still attributed
+        self.widget_outputs: dict[str, str] = {}
+
+    def observe(self, name: str, kind: str, seconds: float) -> None:
+        """
+        Record one invocation of `name` that took `seconds`.
+        """
+        with self._lock:
+            histogram = self._histograms.get((name, kind))
+            if histogram is None:
+                histogram = self._histograms[(name, kind)] = _Histogram(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.bucket_counts[i] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+
+    def add_payload(self, name: str, nbytes: int) -> None:
+        """
+        Count `nbytes` sent to the browser on behalf of output `name`.
+        """
+        with self._lock:
+            self._payload_bytes[name] = self._payload_bytes.get(name, 0) + nbytes
+
+    def count(self, name: str, event: str, n: int = 1) -> None:
+        """
+        Add `n` debounce events of kind `event` ("changes", "recomputes" or
+        "saved") for the debounced input group `name`.
+        """
+        with self._lock:
+            self._debounce_counts[(name, event)] = self._debounce_counts.get((name, event), 0) + n
+
+    def stats(self) -> dict:
+        """
+        Invocation count, total seconds and payload bytes per series.
+        """
+        with self._lock:
+            return {
+                "latency": {
+                    key: {"count": h.count, "sum": h.sum} for key, h in self._histograms.items()
+                },
+                "payload_bytes": dict(self._payload_bytes),
+                "debounce": dict(self._debounce_counts),
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        All series in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP dashboard_latency_seconds Time spent in reactive calcs, output renders and LLM round-trips.",
+            "# TYPE dashboard_latency_seconds histogram",
+        ]
+        with self._lock:
+            for (name, kind), histogram in sorted(self._histograms.items()):
+                labels = f'name="{_escape(name)}",kind="{kind}"'
+                for bound, count in zip(self.buckets, histogram.bucket_counts):
+                    lines.append(f'dashboard_latency_seconds_bucket{{{labels},le="{bound:g}"}} {count}')
+                lines.append(f'dashboard_latency_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"dashboard_latency_seconds_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"dashboard_latency_seconds_count{{{labels}}} {histogram.count}")
+
+            lines += [
+                "# HELP dashboard_output_payload_bytes_total Bytes sent to the browser per output.",
+                "# TYPE dashboard_output_payload_bytes_total counter",
+            ]
+            for name, nbytes in sorted(self._payload_bytes.items()):
+                lines.append(f'dashboard_output_payload_bytes_total{{output="{_escape(name)}"}} {nbytes}')
+
+            lines += [
+                "# HELP dashboard_debounce_events_total Input changes, recomputes they triggered and recomputes saved by debouncing.",
+                "# TYPE dashboard_debounce_events_total counter",
+            ]
+            for (name, event), count in sorted(self._debounce_counts.items()):
+                lines.append(f'dashboard_debounce_events_total{{name="{_escape(name)}",event="{event}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def instrument(registry: MetricsRegistry):
+    """
+    Decorator factory that times reactive calcs and output renderers.
+
+    Place it under `@reactive.calc` to time the calc's function, or above a
+    `@render.*` decorator to time the whole render, including the conversion
+    of a chart into a widget. Bytes sent while a render runs are attributed to
+    that output (see `instrument_session`).
+    """
+
+    def decorate(target):
+        if isinstance(target, Renderer):
+            return _instrument_renderer(registry, target)
+
+        @functools.wraps(target)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return target(*args, **kwargs)
+            finally:
+                registry.observe(target.__name__, "calc", time.perf_counter() - start)
+
+        return timed
+
+    return decorate
+
+
+def _instrument_renderer(registry: MetricsRegistry, renderer):
+    render = renderer.render
+
+    async def timed_render():
+        name = renderer.output_id or renderer.__name__
+        token = _rendering_output.set(name)
+        start = time.perf_counter()
+        try:
+            value = await render()
+        finally:
+            registry.observe(name, "render", time.perf_counter() - start)
+            _rendering_output.reset(token)
+        if isinstance(value, dict) and "model_id" in value:
+            previous = getattr(renderer, "_metrics_model_id", None)
+            registry.widget_outputs.pop(previous, None)
+            registry.widget_outputs[value["model_id"]] = name
+            renderer._metrics_model_id = value["model_id"]
+        return value
+
+    renderer.render = timed_render
+    return renderer
+
+
+def _json_nbytes(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _comm_id(message: str) -> str | None:
+    # shinywidgets messages end with '"ident": "comm-<id>"'; search from the end
+    # so multi-megabyte chart payloads are not scanned
+    start = message.rfind('"ident": "comm-')
+    if start < 0:
+        return None
+    start += len('"ident": "comm-')
+    return message[start:message.find('"', start)]
+
+
+def instrument_session(registry: MetricsRegistry, session) -> None:
+    """
+    Attribute every message `session` sends to the output that caused it.
+
+    Values in Shiny's output updates are counted per output id. Widget
+    messages are counted against the output whose render is running, or
+    otherwise against the output whose widget they address.
+
+    This wraps the session's private `_send_message`, the one place all
+    outgoing messages pass through; Shiny has no public hook for it.
+    """
+    send = session._send_message
+
+    async def counted_send(message: dict) -> None:
+        for name, value in (message.get("values") or {}).items():
+            registry.add_payload(name, _json_nbytes(value))
+        for payload in (message.get("custom") or {}).values():
+            name = _rendering_output.get()
+            if name is None and isinstance(payload, str):
+                name = registry.widget_outputs.get(_comm_id(payload))
+            # Widget payloads arrive already serialised by shinywidgets
+            nbytes = len(payload) if isinstance(payload, str) else _json_nbytes(payload)
+            registry.add_payload(name or "(other)", nbytes)
+        await send(message)
+
+    session._send_message = counted_send
+
+
+def instrument_chat_client(registry: MetricsRegistry, client, name: str = "querychat") -> None:
+    """
+    Time each LLM round-trip of a chatlas client, from the request until the
+    streamed reply (including tool calls such as QueryChat's SQL) is complete.
+    """
+    stream_async = client.stream_async
+
+    async def timed_stream_async(*args, **kwargs):
+        start = time.perf_counter()
+        response = await stream_async(*args, **kwargs)
+
+        async def timed_response():
+            try:
+                async for chunk in response:
+                    yield chunk
+            finally:
+                registry.observe(name, "llm", time.perf_counter() - start)
+
+        return timed_response()
+
+    client.stream_async = timed_stream_async
+
+
+def metrics_route(registry: MetricsRegistry, path: str = "/metrics"):
+    """
+    A Starlette route serving `registry` in the Prometheus text format.
+    """
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    def endpoint(request):
+        return PlainTextResponse(registry.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    return Route(path, endpoint)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .dataset import STUDENT_SCHEMA
+
+# Score and hour columns drawn together so their correlations survive
+NUMERIC_COLUMNS = [
+    "Avg_Daily_Usage_Hours",
+    "Sleep_Hours_Per_Night",
+    "Addicted_Score",
+    "Mental_Health_Score",
+    "Conflicts_Over_Social_Media",
+]
+
+# Synthetic rows follow the processed student table's schema
+SYNTHETIC_SCHEMA = STUDENT_SCHEMA
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+@dataclass(frozen=True)
+class _Joint:
+    """
+    Empirical joint distribution of a few categorical columns.
+    """
+
+    combos: pa.Table
+    probabilities: np.ndarray
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, columns: list[str]) -> "_Joint":
+        counts = df.groupby(columns, observed=True, dropna=False).size().reset_index(name="n")
+        combos = pa.Table.from_pandas(counts[columns].astype(object), preserve_index=False)
+        return cls(combos, (counts["n"] / counts["n"].sum()).to_numpy())
+
+    def sample(self, rng: np.random.Generator, rows: int) -> pa.Table:
+        picks = rng.choice(len(self.probabilities), size=rows, p=self.probabilities)
+        return self.combos.take(pa.array(picks))
+
+
+@dataclass(frozen=True)
+class SyntheticModel:
+    """
+    Distributions learned from the real student table.
+
+    Country x Platform and Age x Academic_Level are sampled from their
+    empirical joint frequencies; Gender and Relationship_Status from their
+    marginals. The numeric columns use a Gaussian copula: correlated normal
+    draws are mapped back through each column's empirical quantiles, so every
+    generated value is one that occurs in the real data and usage, sleep,
+    addiction and mental health keep their rank correlations.
+    Affects_Academic_Performance is drawn from its observed rate at each
+    Addicted_Score.
+    """
+
+    joints: tuple[_Joint, ...]
+    numeric_sorted: dict[str, np.ndarray]
+    latent_correlation: np.ndarray
+    affected_rate: np.ndarray
+
+    def sample(self, rng: np.random.Generator, rows: int, first_id: int = 1) -> pa.Table:
+        """
+        Draw `rows` synthetic students as an Arrow table in `SYNTHETIC_SCHEMA`.
+        """
+        columns = {"Student_ID": pa.array(np.arange(first_id, first_id + rows, dtype=np.int64))}
+        for joint in self.joints:
+            drawn = joint.sample(rng, rows)
+            columns.update(zip(drawn.column_names, drawn.columns))
+
+        numeric = self._sample_numeric(rng, rows)
+        columns.update((column, pa.array(values)) for column, values in numeric.items())
+
+        affected = rng.random(rows) < self.affected_rate[numeric["Addicted_Score"]]
+        columns["Affects_Academic_Performance"] = pa.array(["No", "Yes"]).take(pa.array(affected.astype(np.int8)))
+
+        return pa.table(
+            [columns[field.name].cast(field.type) for field in SYNTHETIC_SCHEMA], schema=SYNTHETIC_SCHEMA
+        )
+
+    def _sample_numeric(self, rng: np.random.Generator, rows: int, correlation=None) -> dict[str, np.ndarray]:
+        correlation = self.latent_correlation if correlation is None else correlation
+        normal = rng.multivariate_normal(
+            np.zeros(len(NUMERIC_COLUMNS)), correlation, size=rows, method="cholesky"
+        )
+        quantiles = _normal_cdf(normal)
+        result = {}
+        for i, column in enumerate(NUMERIC_COLUMNS):
+            values = self.numeric_sorted[column]
+            positions = np.minimum((quantiles[:, i] * len(values)).astype(np.int64), len(values) - 1)
+            result[column] = values[positions]
+        return result
+
+
+def _normal_cdf(x: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26 erf approximation (error < 1.5e-7), which is
+    # far finer than the quantile steps of the real data
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def _nearest_correlation(matrix: np.ndarray) -> np.ndarray:
+    # Clip negative eigenvalues and rescale to a unit diagonal
+    eigenvalues, eigenvectors = np.linalg.eigh((matrix + matrix.T) / 2)
+    fixed = eigenvectors @ np.diag(np.clip(eigenvalues, 1e-6, None)) @ eigenvectors.T
+    scale = np.sqrt(np.diag(fixed))
+    return fixed / np.outer(scale, scale)
+
+
+def fit_synthetic_model(df: pd.DataFrame, calibration_rows: int = 200_000, iterations: int = 8) -> SyntheticModel:
+    """
+    Learn the distributions the generator reproduces from the real table.
+
+    The scores and hours are discrete, so mapping correlated normals onto
+    them weakens the correlation. The latent correlation is therefore
+    calibrated: starting from the real rank correlation, it is nudged for a
+    few rounds until a sample of `calibration_rows` reproduces the real
+    Spearman correlation.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The processed student table (with `iso_alpha`).
+
+    Returns
+    -------
+    SyntheticModel
+    """
+    target = df[NUMERIC_COLUMNS].corr(method="spearman").to_numpy()
+    affected = df["Affects_Academic_Performance"].astype(str).eq("Yes").groupby(df["Addicted_Score"]).mean()
+    affected_rate = np.zeros(int(df["Addicted_Score"].max()) + 1)
+    affected_rate[affected.index.to_numpy()] = affected.to_numpy()
+
+    model = SyntheticModel(
+        joints=(
+            _Joint.fit(df, ["Country", "Most_Used_Platform", "iso_alpha"]),
+            _Joint.fit(df, ["Age", "Academic_Level"]),
+            _Joint.fit(df, ["Gender"]),
+            _Joint.fit(df, ["Relationship_Status"]),
+        ),
+        numeric_sorted={column: np.sort(df[column].to_numpy()) for column in NUMERIC_COLUMNS},
+        latent_correlation=_nearest_correlation(target),
+        affected_rate=affected_rate,
+    )
+
+    latent = model.latent_correlation
+    rng = np.random.default_rng(0)
+    for _ in range(iterations):
+        sample = pd.DataFrame(model._sample_numeric(rng, calibration_rows, latent))
+        achieved = sample[NUMERIC_COLUMNS].corr(method="spearman").to_numpy()
+        latent = _nearest_correlation(np.clip(latent + (target - achieved), -0.999, 0.999))
+    return replace(model, latent_correlation=latent)
+
+
+def iter_synthetic(
+    model: SyntheticModel, rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pa.Table]:
+    """
+    Yield `rows` synthetic students in chunks of at most `chunk_rows`.
+
+    Each chunk has its own random stream derived from `seed` and the chunk
+    number, so the output depends only on (model, rows, seed, chunk_rows).
+    """
+    for index, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, index])
+        yield model.sample(rng, min(chunk_rows, rows - start), first_id=start + 1)
+
+
+def write_synthetic_parquet(
+    model: SyntheticModel,
+    path: str | Path,
+    rows: int,
+    seed: int = 0,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Path:
+    """
+    Write `rows` synthetic students to a Parquet file one chunk at a time.
+
+    Only one chunk is in memory at once, so the row count is limited by disk
+    rather than RAM. Each chunk becomes one row group.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(path, SYNTHETIC_SCHEMA) as writer:
+        for chunk in iter_synthetic(model, rows, seed, chunk_rows):
+            writer.write_table(chunk)
+    return path
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+from shiny.testserver import test_server
+
+from src import app
+from src.cache import normalize_filters
+from src.logic import IncrementalFilter, portable_dtypes
+
+CHART_OUTPUTS = ["scatter_chart", "plot_AAP", "plot_academiclvldist", "donut_academic_level", "sunburst_platform"]
+
+
+def build(cancelled=None, **filters):
+    return app.build_dashboard(
+        filters,
+        normalize_filters(**filters),
+        IncrementalFilter(app.students_index),
+        threading.Lock(),
+        cancelled or threading.Event(),
+    )
+
+
+def settle(session, ready, timeout=10):
+    # The build runs on the worker pool, so flush until its result has landed
+    deadline = time.monotonic() + timeout
+    while not ready() and time.monotonic() < deadline:
+        session.flush()
+        time.sleep(0.05)
+
+
+def test_build_dashboard_computes_every_dashboard_output_off_the_event_loop():
+    """This test verifies that the worker computation returns the tile summary and a figure for every dashboard chart, including the no-data figures for an empty filter state."""
+    results = build(gender="Male")
+    empty = build(age_range=(99, 100))
+
+    assert results["key"] == normalize_filters(gender="Male")
+    assert results["summary"].tiles["Students"] == len(app.students_index.positions(gender="Male"))
+    assert all(results[name] is not None for name in CHART_OUTPUTS)
+    assert empty["summary"].tiles["Students"] == 0
+    assert empty["donut_academic_level"].layout.annotations[0].text == "No data available"
+
+
+def test_build_dashboard_times_each_output_stage():
+    """This test verifies that every background build stage is recorded as a "build" latency series named after its output, so /metrics still shows which chart is slow."""
+    before = app.render_metrics.stats()["latency"]
+
+    build(gender="Female")
+
+    after = app.render_metrics.stats()["latency"]
+    for name in ["dashboard_summary", *CHART_OUTPUTS]:
+        previous = before.get((name, "build"), {"count": 0})["count"]
+        assert after[(name, "build")]["count"] == previous + 1
+    assert 'name="scatter_chart",kind="build"' in app.render_metrics.to_prometheus()
+
+
+def test_superseded_computation_stops_before_its_next_stage():
+    """This test verifies that a worker whose filter state has been superseded stops at its next stage instead of finishing the figures."""
+    cancelled = threading.Event()
+    cancelled.set()
+
+    with pytest.raises(app.Superseded):
+        build(cancelled, countries=["India"])
+
+
+def test_failed_build_shows_inline_errors_and_keeps_the_session_open(monkeypatch):
+    """This test verifies that a failing background build only turns the dashboard outputs into inline errors: the map's update effect does not re-raise it, so the session stays open and the next filter change renders normally."""
+    def unavailable(filters, key):
+        raise RuntimeError("cube unavailable")
+
+    monkeypatch.setattr(app, "FILTER_DEBOUNCE_SECONDS", 0)
+    monkeypatch.setattr(app, "dashboard_summary", unavailable)
+    with test_server(app.app) as session:
+        session.set_inputs(f_gender="All", f_age=(app.AGE_MIN, app.AGE_MAX), f_level="All", f_country=(), f_platform=())
+        settle(session, lambda: session.get_output("tile_students").status == "error")
+        assert session.get_output("tile_students").error == "cube unavailable"
+
+        monkeypatch.undo()
+        session.set_inputs(f_gender="Male")
+        settle(session, lambda: session.is_ok)
+
+        assert session.is_ok, session.error
+        assert session.get_output("tile_students") == str(len(app.students_index.positions(gender="Male")))
+
+
+def test_querychat_sql_runs_on_wide_integer_columns():
+    """This test verifies that QueryChat queries the dashboard's own compact frame through a view that casts to int64 and plain strings, so arithmetic in LLM-written SQL does not overflow and no second copy of the data is kept."""
+    source = app.querychat()._data_sources["df"]
+    assert source.get_data() is app.students_df
+
+    product = source.execute_query("SELECT max(Addicted_Score * Mental_Health_Score * Age) AS m FROM df")
+    scaled = source.execute_query("SELECT max(Student_ID * 100) AS m FROM df")
+
+    expected = app.students_df.astype({"Addicted_Score": "int64", "Mental_Health_Score": "int64", "Age": "int64"})
+    assert product["m"].iloc[0] == (expected["Addicted_Score"] * expected["Mental_Health_Score"] * expected["Age"]).max()
+    assert scaled["m"].iloc[0] == int(app.students_df["Student_ID"].max()) * 100
+    assert source.execute_query("SELECT * FROM df LIMIT 5").dtypes.equals(portable_dtypes(app.students_df).dtypes)
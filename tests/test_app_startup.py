@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds importing src/app.py may take on top of shiny and shinywidgets.
+# Loading the data and pandas costs ~0.7 s on a laptop; eagerly importing
+# altair, plotly, ibis and querychat again would add ~2 s.
+IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "1.5"))
+
+DEFERRED_MODULES = ["altair", "plotly", "ibis", "querychat", "pycountry", "vegafusion"]
+
+PROBE = """
+import json, sys, time
+import shiny, shinywidgets
+start = time.perf_counter()
+import src.app
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % DEFERRED_MODULES
+
+
+def test_app_import_defers_heavy_libraries_within_budget():
+    """This test verifies that a cold import of the app loads none of the chart, database or LLM libraries and stays within the import-time budget."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT), "DASHBOARD_PUSHDOWN": "0"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["loaded"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS, (
+        f"Importing src/app.py took {report['seconds']:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+    )
+
+
+def test_pushdown_startup_loads_no_rows_into_pandas(tmp_path):
+    """This test verifies that in pushdown mode the app builds neither the pandas table nor its filter index, and takes the sidebar choices from DuckDB when the metadata sidecar is missing."""
+    data = tmp_path / "students.parquet"
+    data.write_bytes((ROOT / "data" / "processed" / "Students-Social-Media-Addiction.parquet").read_bytes())
+    probe = (
+        "import json, src.app as app; print(json.dumps({'df': app.students_df is None, "
+        "'index': app.students_index is None, 'countries': len(app._countries), 'rows': app.dataset_meta['row_count']}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT), "DASHBOARD_PUSHDOWN": "1", "DASHBOARD_DATA": str(data)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["df"] and report["index"]
+    assert report["countries"] > 100 and report["rows"] == 705
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache import LRUCache, estimate_nbytes, is_refinement, normalize_filters
+from src.logic import DashboardCube, summarize_dashboard
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+
+
+def test_normalize_filters_treats_equivalent_selections_as_one_key():
+    """This test verifies that selections picking the same rows (reordered lists, None vs empty) share a cache key so sessions reuse each other's results."""
+    a = normalize_filters(age_range=[18, 22], countries=["USA", "Canada"], platforms=None)
+    b = normalize_filters(age_range=(18, 22), countries=["Canada", "USA", "USA"], platforms=[])
+
+    assert a == b
+    assert a != normalize_filters(age_range=(18, 23), countries=["Canada", "USA"])
+
+
+def test_is_refinement_detects_narrowing_and_widening():
+    """This test verifies that only filter changes that shrink the selection count as refinements, so incremental filtering never misses rows."""
+    base = normalize_filters(age_range=(18, 25), countries=["Canada", "USA"])
+
+    assert is_refinement(base, normalize_filters(age_range=(19, 25), countries=["USA"]))
+    assert is_refinement(base, normalize_filters(age_range=(18, 25), countries=["USA"], gender="Male"))
+    assert not is_refinement(base, normalize_filters(age_range=(17, 25), countries=["USA"]))
+    assert not is_refinement(base, normalize_filters(age_range=(18, 25)))
+    assert not is_refinement(
+        normalize_filters(gender="Male"), normalize_filters(gender="Female")
+    )
+
+
+def test_lru_cache_counts_hits_and_evicts_least_recently_used():
+    """This test verifies hit/miss counting and that the entry bound evicts the least recently used value first."""
+    cache = LRUCache(max_entries=2)
+
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_respects_memory_bound():
+    """This test verifies that the memory bound evicts old arrays and never stores a value larger than the whole budget."""
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+
+    cache.put("small-1", np.zeros(50))
+    cache.put("small-2", np.zeros(50))
+    cache.put("small-3", np.zeros(50))
+    cache.put("huge", np.zeros(1000))
+
+    assert "huge" not in cache
+    assert "small-1" not in cache
+    assert "small-2" in cache and "small-3" in cache
+    assert cache.nbytes <= 1000
+
+    calls = []
+    value = cache.get_or_compute("k", lambda: calls.append(1) or 42)
+    assert cache.get_or_compute("k", lambda: calls.append(1) or 0) == value == 42
+    assert len(calls) == 1
+
+
+def test_memory_bound_counts_and_evicts_dashboard_summaries():
+    """This test verifies that a cached DashboardSummary is sized by its frames rather than as a bare object, so the memory bound evicts summaries."""
+    students = pd.read_parquet(DATA_PATH)
+    cube = DashboardCube(students)
+    summaries = [summarize_dashboard(cube.query(gender=g)) for g in ("All", "Male", "Female")]
+    sizes = [estimate_nbytes(summary) for summary in summaries]
+    assert sizes[0] > estimate_nbytes(summaries[0].countries) > 1000
+
+    # Room for two summaries but not all three
+    cache = LRUCache(max_entries=100, max_bytes=sum(sizes) - 1)
+    for i, summary in enumerate(summaries):
+        cache.put(i, summary)
+
+    assert 0 not in cache
+    assert 1 in cache and 2 in cache
+    assert cache.nbytes == sizes[1] + sizes[2]
@@ -0,0 +1,113 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from src.cache import LRUCache, estimate_nbytes
+from src.charts import (
+    build_level_gender_chart,
+    build_scatter_chart,
+    chart_memo,
+    chart_nbytes,
+    counts_for,
+    frame_fingerprint,
+    spec_nbytes,
+    spec_payload,
+)
+from src.logic import compact_dtypes, portable_dtypes
+
+
+def make_chart_df():
+    return pd.DataFrame(
+        {
+            "Gender": ["Male", "Female", "Female", "Male", "Female", "Male"],
+            "Academic_Level": ["Undergraduate", "Graduate", "Undergraduate", "Graduate", "Graduate", "Undergraduate"],
+            "Addicted_Score": [7, 5, 8, 3, 6, 9],
+            "Mental_Health_Score": [5, 7, 4, 8, 6, 3],
+            "Sleep_Hours_Per_Night": [6.5, 7.0, 5.5, 8.0, 6.0, 5.0],
+        }
+    )
+
+
+def test_chart_builders_reuse_results_for_identical_content():
+    """This test verifies that the dashboard and chatbot builders return the memoised aggregate and chart for equal data held in different frames, and rebuild when the data changes."""
+    chart_memo.clear()
+    df = make_chart_df()
+    same_content = make_chart_df().set_index(pd.Index(range(10, 16)))
+
+    assert frame_fingerprint(df) == frame_fingerprint(same_content)
+    assert counts_for(df, ["Academic_Level", "Gender"]) is counts_for(same_content, ["Academic_Level", "Gender"])
+
+    counts = counts_for(df, ["Academic_Level", "Gender"])
+    assert build_level_gender_chart(counts) is build_level_gender_chart(counts.copy())
+    assert build_scatter_chart(df, max_points=100) is build_scatter_chart(same_content, max_points=100)
+
+    changed = df.assign(Addicted_Score=df["Addicted_Score"] + 1)
+    assert frame_fingerprint(changed) != frame_fingerprint(df)
+    assert build_scatter_chart(changed, max_points=100) is not build_scatter_chart(df, max_points=100)
+
+
+def test_dashboard_and_chatbot_frames_for_the_same_rows_share_memo_entries():
+    """This test verifies that the dashboard's compact frame (categoricals, int8) and the chatbot's query result for the same rows (strings, int64) share a fingerprint, so the second tab reuses the first tab's memoised aggregate and chart."""
+    chart_memo.clear()
+    dashboard = compact_dtypes(make_chart_df())
+    chatbot = portable_dtypes(make_chart_df())
+    assert isinstance(dashboard["Gender"].dtype, pd.CategoricalDtype) and dashboard["Addicted_Score"].dtype == "int8"
+
+    assert frame_fingerprint(dashboard) == frame_fingerprint(chatbot)
+    counts = counts_for(dashboard, ["Academic_Level", "Gender"])
+    chart = build_scatter_chart(dashboard, max_points=100)
+    entries = len(chart_memo)
+
+    assert counts_for(chatbot, ["Academic_Level", "Gender"]) is counts
+    assert build_scatter_chart(chatbot, max_points=100) is chart
+    assert len(chart_memo) == entries
+
+
+def test_scatter_builder_bins_large_inputs_and_handles_empty_data():
+    """This test verifies that the shared scatter builder bins above the point limit and shows the no-data chart for an empty frame."""
+    df = make_chart_df()
+
+    binned = build_scatter_chart(df, max_points=3).to_dict()
+    points = build_scatter_chart(df, max_points=100).to_dict()
+    empty = build_scatter_chart(df.iloc[0:0], max_points=100).to_dict()
+
+    assert binned["encoding"]["size"]["field"] == "Count"
+    assert "size" not in points["encoding"]
+    assert empty["mark"]["type"] == "text"
+
+
+def test_vegafusion_mode_moves_scatter_jitter_to_the_server():
+    """This test verifies that with VegaFusion enabled the point scatter carries precomputed jitter instead of a client-side random() transform, and its spec compiles on the server."""
+    df = make_chart_df()
+
+    client = build_scatter_chart(df, max_points=100).to_dict()
+    with alt.data_transformers.enable("vegafusion"):
+        server_chart = build_scatter_chart(df, max_points=100)
+        server_spec = spec_payload(server_chart)
+        assert spec_nbytes(server_chart) > 0
+
+    assert "random()" in str(client["transform"])
+    assert "random()" not in str(server_spec)
+    assert "/vega/" in server_spec["$schema"]
+
+
+def test_memoised_charts_are_sized_by_their_embedded_data():
+    """This test verifies that a memoised chart counts the rows it embeds toward the memo's memory bound, so large scatter charts are evicted instead of being counted as tiny objects."""
+    rng = np.random.default_rng(0)
+    points = pd.DataFrame(
+        {
+            "Addicted_Score": rng.integers(1, 10, 4000),
+            "Mental_Health_Score": rng.integers(1, 10, 4000),
+            "Sleep_Hours_Per_Night": rng.uniform(4, 9, 4000),
+        }
+    )
+    charts = [build_scatter_chart(points.assign(Addicted_Score=points["Addicted_Score"] + i), max_points=5000) for i in range(3)]
+    size = chart_nbytes(charts[0])
+    assert size > estimate_nbytes(points) > 50_000
+
+    memo = LRUCache(max_entries=100, max_bytes=int(size * 2.5), sizeof=chart_nbytes)
+    for i, chart in enumerate(charts):
+        memo.put(i, chart)
+
+    assert 0 not in memo
+    assert 1 in memo and 2 in memo
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import duckdb
+import ibis
+import pandas as pd
+
+from src.dataset import STUDENT_COLUMNS, ParquetLayout, read_students, row_groups_to_read, students_table
+from src.logic import apply_dashboard_filters
+
+DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "processed" / "Students-Social-Media-Addiction.parquet"
+
+
+def write_partitioned(path):
+    students = pd.read_parquet(DATA_PATH)
+    students = students[students["Country"].isin(["India", "USA", "Canada"])]
+    batches = [students.iloc[::2].assign(batch_date="2026-10-01"), students.iloc[1::2].assign(batch_date="2026-10-18")]
+    for batch in batches:
+        batch.to_parquet(path, partition_cols=["Country", "batch_date"])
+    return students
+
+
+def test_partitioned_dataset_reads_like_the_single_file(tmp_path):
+    """This test verifies that a Country/batch_date partitioned dataset loads with the single-file column order and the same rows, without the batch_date column."""
+    students = write_partitioned(tmp_path / "students")
+
+    loaded = read_students(tmp_path / "students")
+
+    assert loaded.columns.tolist() == STUDENT_COLUMNS
+    assert sorted(loaded["Student_ID"]) == sorted(students["Student_ID"])
+
+
+def test_country_filters_only_scan_matching_partitions(tmp_path):
+    """This test verifies that pushdown queries with a country filter or map click skip other countries' partition files, by corrupting those files and still getting the right rows."""
+    students = write_partitioned(tmp_path / "students")
+    for path in (tmp_path / "students" / "Country=USA").rglob("*.parquet"):
+        path.write_bytes(b"not parquet")
+
+    table = students_table(ibis.duckdb.connect(), tmp_path / "students")
+    filtered = apply_dashboard_filters(table, countries=["India", "Canada"]).execute()
+    clicked = apply_dashboard_filters(table, clicked_country="India").execute()
+
+    assert len(filtered) == students["Country"].isin(["India", "Canada"]).sum()
+    assert len(clicked) == (students["Country"] == "India").sum()
+
+
+def test_sorted_layout_lets_filters_skip_row_groups(tmp_path):
+    """This test verifies that writing with country sort keys and small row groups lets a clicked-country filter skip most row groups while never skipping a group that holds matching rows."""
+    students = pd.read_parquet(DATA_PATH).sample(20_000, replace=True, random_state=0)
+    layouts = {
+        "input": ParquetLayout(sort_by=(), row_group_size=2048),
+        "sorted": ParquetLayout(sort_by=("Country", "Age"), row_group_size=2048, compression="zstd", dictionary=False),
+    }
+    reads = {}
+    for name, layout in layouts.items():
+        path = tmp_path / f"{name}.parquet"
+        duckdb.connect().execute(
+            f"COPY (SELECT * FROM students {layout.order_by()}) TO '{path}' (FORMAT PARQUET, {layout.copy_options()})"
+        )
+        reads[name] = row_groups_to_read(path, clicked_country="India")
+
+    groups_read, groups, rows_read, rows = reads["sorted"]
+    assert rows == len(students) and groups > 5
+    assert groups_read <= 2
+    assert rows_read >= (students["Country"] == "India").sum()
+    assert reads["input"][0] == reads["input"][1]
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from shiny import reactive
+
+from src.debounce import Debouncer, debounced
+from src.metrics import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_of_changes_settles_once_to_the_last_value():
+    """This test verifies that the first value settles at once and a burst of later changes settles only after the quiet window, as its last value, counting the coalesced changes as saved."""
+    clock = FakeClock()
+    debouncer = Debouncer(0.25, clock)
+
+    debouncer.offer({"countries": None})
+    assert debouncer.wait() == 0
+    assert debouncer.settle() == (True, {"countries": None}, 0)
+
+    for countries in (["India"], ["India", "USA"], ["India", "USA", "Canada"]):
+        debouncer.offer({"countries": countries})
+        clock.now += 0.1
+    assert debouncer.wait() == pytest.approx(0.25 - 0.1)
+
+    clock.now += 0.2
+    assert debouncer.wait() == 0
+    assert debouncer.settle() == (True, {"countries": ["India", "USA", "Canada"]}, 2)
+    assert debouncer.wait() is None
+    assert (debouncer.changes, debouncer.recomputes, debouncer.saved) == (4, 2, 2)
+
+
+def test_burst_back_to_the_settled_value_triggers_no_recompute():
+    """This test verifies that ticking and unticking a box within the window settles to no change, and that the registry exposes debounce counters in the Prometheus text."""
+    clock = FakeClock()
+    debouncer = Debouncer(0.25, clock)
+    debouncer.offer({"gender": "All"})
+    debouncer.settle()
+
+    debouncer.offer({"gender": "Male"})
+    debouncer.offer({"gender": "All"})
+    clock.now += 1
+    changed, value, saved = debouncer.settle()
+
+    assert not changed and value == {"gender": "All"} and saved == 2
+    assert debouncer.saved == 2
+
+    registry = MetricsRegistry()
+    registry.count("filters", "changes", 3)
+    registry.count("filters", "saved", saved)
+    assert registry.stats()["debounce"] == {("filters", "changes"): 3, ("filters", "saved"): 2}
+    assert 'dashboard_debounce_events_total{name="filters",event="saved"} 2' in registry.to_prometheus()
+
+
+def test_debounced_calc_emits_only_the_settled_value_and_counts_saved_recomputes():
+    """This test verifies that the Shiny wrapper passes the first value through at once, holds back a burst of changes until invalidate_later fires after the quiet window, then emits only the last value and counts the skipped recomputes."""
+    registry = MetricsRegistry()
+
+    async def scenario():
+        source = reactive.value({"gender": "All"})
+        settled = debounced(source.get, 0.1, registry)
+        seen = []
+
+        @reactive.effect
+        def _record():
+            seen.append(settled())
+
+        await reactive.flush()
+        assert seen == [{"gender": "All"}]
+
+        for gender in ("Male", "Female", "Male"):
+            source.set({"gender": gender})
+            await reactive.flush()
+        assert seen == [{"gender": "All"}]
+
+        await asyncio.sleep(0.3)
+        return seen
+
+    seen = asyncio.run(scenario())
+
+    assert seen == [{"gender": "All"}, {"gender": "Male"}]
+    assert registry.stats()["debounce"] == {
+        ("filters", "changes"): 4,
+        ("filters", "recomputes"): 2,
+        ("filters", "saved"): 2,
+    }
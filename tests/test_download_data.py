@@ -0,0 +1,46 @@
+import json
+
+from src.download_data import MANIFEST_NAME, LocalSource, download_data
+
+
+def test_unchanged_download_reuses_snapshot_and_copies_nothing(tmp_path, monkeypatch):
+    """This test verifies that downloading an unchanged local source twice gives the same snapshot id and neither re-hashes nor copies the raw files the second time."""
+    source = tmp_path / "source"
+    (source / "nested").mkdir(parents=True)
+    (source / "students.csv").write_text("Student_ID,Age\n1,19\n")
+    (source / "nested" / "notes.txt").write_text("v1\n")
+    raw_dir, store = tmp_path / "raw", tmp_path / "snapshots"
+
+    first = download_data(LocalSource(source), raw_dir, store)
+    assert (raw_dir / "students.csv").read_text() == "Student_ID,Age\n1,19\n"
+    assert (raw_dir / "nested" / "notes.txt").read_text() == "v1\n"
+
+    copies, hashes = [], []
+    monkeypatch.setattr("src.download_data.shutil.copyfile", lambda *args: copies.append(args))
+    monkeypatch.setattr("src.download_data.file_sha256", lambda path, *args: hashes.append(path))
+    second = download_data(LocalSource(source), raw_dir, store)
+
+    assert second == first
+    assert copies == [] and hashes == []
+    assert json.loads((raw_dir / MANIFEST_NAME).read_text())["snapshot"] == first
+
+
+def test_changed_file_gets_a_new_snapshot_and_old_one_stays_intact(tmp_path):
+    """This test verifies that a modified or removed source file produces a new snapshot, updates the raw directory, and leaves the previous snapshot's stored files unchanged."""
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "students.csv").write_text("Student_ID,Age\n1,19\n")
+    (source / "old.csv").write_text("dropped\n")
+    raw_dir, store = tmp_path / "raw", tmp_path / "snapshots"
+    first = download_data(LocalSource(source), raw_dir, store)
+
+    (source / "students.csv").write_text("Student_ID,Age\n1,19\n2,21\n")
+    (source / "old.csv").unlink()
+    second = download_data(LocalSource(source), raw_dir, store)
+
+    assert second != first
+    assert (raw_dir / "students.csv").read_text() == "Student_ID,Age\n1,19\n2,21\n"
+    assert not (raw_dir / "old.csv").exists()
+    first_listing = json.loads((store / f"{first}.json").read_text())
+    stored = store / "objects" / first_listing["students.csv"]["sha256"][:2] / first_listing["students.csv"]["sha256"]
+    assert stored.read_text() == "Student_ID,Age\n1,19\n"
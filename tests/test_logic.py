@@ -1,7 +1,16 @@
+import ibis
 import pandas as pd
 
 from src.logic import (
+    DashboardCube,
+    DashboardFilterIndex,
+    IncrementalFilter,
     apply_dashboard_filters,
+    bin_scatter,
+    compact_dtypes,
+    count_by,
+    summarize_dashboard,
+    summarize_stat_tiles,
     summarize_country_metrics,
     group_platforms_for_sunburst,
     get_iso3,
@@ -73,6 +82,132 @@ def test_apply_dashboard_filters_clicked_country_overrides_to_single_country():
     assert set(result["Country"]) == {"India"}
 
 
+def test_filter_index_matches_reference_filters():
+    """This test verifies that the bitmap filter index returns exactly the rows of the reference pandas filter so the faster path never changes what the dashboard shows."""
+    df = make_test_df()
+    index = DashboardFilterIndex(df)
+
+    cases = [
+        {},
+        {"gender": "Female", "age_range": (19, 22)},
+        {"academic_level": "Graduate", "countries": ["USA", "India"]},
+        {"platforms": ["Instagram", "TikTok"], "clicked_country": "Canada"},
+        {"countries": ["Atlantis"]},
+        {"age_range": [30, 40]},
+    ]
+
+    for filters in cases:
+        expected = apply_dashboard_filters(df, **filters)
+        result = index.filter(**filters)
+        assert list(result.index) == list(expected.index)
+
+
+def test_incremental_filter_refines_and_falls_back_correctly():
+    """This test verifies that narrowing filters reuse the previous subset, widening triggers a full recompute, and both give the reference rows."""
+    df = make_test_df()
+    engine = IncrementalFilter(DashboardFilterIndex(df))
+
+    steps = [
+        {"countries": ["Canada", "USA", "India"]},
+        {"countries": ["Canada", "USA"]},
+        {"countries": ["Canada", "USA"], "age_range": (18, 20)},
+        {"countries": ["Canada", "USA"], "age_range": (18, 20), "gender": "Male"},
+        {"countries": ["Canada"], "age_range": (18, 23)},
+    ]
+
+    for filters in steps:
+        expected = apply_dashboard_filters(df, **filters)
+        assert list(df.index[engine.positions(**filters)]) == list(expected.index)
+
+    assert engine.refinements == 3
+    assert engine.full_scans == 2
+
+
+def test_pushdown_filters_and_aggregates_match_pandas():
+    """This test verifies that pushdown mode (ibis/DuckDB) produces the same tiles, counts and country metrics as the pandas path so switching modes never changes the numbers."""
+    df = make_test_df()
+    table = ibis.memtable(df)
+    filters = {"gender": "Female", "age_range": (18, 23), "countries": ["Canada", "India"]}
+
+    local = apply_dashboard_filters(df, **filters)
+    pushed = apply_dashboard_filters(table, **filters)
+
+    assert summarize_stat_tiles(pushed) == summarize_stat_tiles(local)
+    assert count_by(pushed, ["Gender"]).to_dict("list") == count_by(local, ["Gender"]).to_dict("list")
+
+    local_map = summarize_country_metrics(local).reset_index(drop=True)
+    pushed_map = summarize_country_metrics(pushed)
+    assert list(pushed_map["Country"]) == list(local_map["Country"])
+    assert list(pushed_map["Student_ID"]) == list(local_map["Student_ID"])
+
+
+def test_cube_query_matches_row_level_aggregates():
+    """This test verifies that summing aggregate-cube cells gives the same tiles and chart counts as aggregating the filtered rows, so the cube is a drop-in source for the summary charts."""
+    df = make_test_df()
+    cube = DashboardCube(df)
+    filters = {"gender": "Male", "age_range": (18, 22), "platforms": ["Instagram", "WhatsApp"]}
+
+    selection = cube.query(**filters)
+    rows = apply_dashboard_filters(df, **filters)
+
+    expected_tiles = summarize_stat_tiles(rows)
+    for key, value in summarize_stat_tiles(selection).items():
+        assert round(value, 6) == round(expected_tiles[key], 6)
+
+    expected_counts = count_by(rows, ["Country"])
+    assert count_by(selection, ["Country"]).to_dict("list") == expected_counts.to_dict("list")
+
+    empty = cube.query(age_range=(40, 50))
+    assert summarize_stat_tiles(empty)["Students"] == 0
+
+
+def test_summarize_dashboard_matches_individual_aggregates():
+    """This test verifies that the single-pass dashboard summary gives the same numbers as running each chart's aggregation separately, so the fused stage can feed every renderer."""
+    df = make_test_df()
+
+    summary = summarize_dashboard(df)
+
+    assert summary.tiles == summarize_stat_tiles(df)
+    assert summary.level_gender.to_dict("list") == count_by(df, ["Academic_Level", "Gender"]).to_dict("list")
+    assert summary.academic_performance.to_dict("list") == count_by(df, ["Affects_Academic_Performance"]).to_dict("list")
+    assert set(summary.platforms["Platform_Group"]) == set(group_platforms_for_sunburst(df)["Platform_Group"])
+
+    countries = summary.countries.set_index("Country")
+    assert countries.loc["Canada", "Student_ID"] == 2
+    assert round(countries.loc["Canada", "Avg_Daily_Usage_Hours"], 2) == 4.5
+
+
+def test_bin_scatter_counts_rows_and_averages_sleep_per_bin():
+    """This test verifies that the server-side scatter bins keep every student and average sleep within each bin, so the binned chart is a faithful summary."""
+    df = make_test_df()
+    df.loc[1, ["Addicted_Score", "Mental_Health_Score"]] = [6, 5]
+
+    bins = bin_scatter(df).set_index(["Addicted_Score", "Mental_Health_Score"])
+
+    assert bins["Count"].sum() == len(df)
+    assert bins.loc[(6, 5), "Count"] == 2
+    assert round(bins.loc[(6, 5), "Sleep_Hours_Per_Night"], 2) == 6.5
+
+    coarse = bin_scatter(df, bin_width=5)
+    assert set(coarse["Addicted_Score"]) <= {0.0, 5.0}
+
+
+def test_compact_dtypes_shrinks_memory_without_changing_values():
+    """This test verifies that the compact loader uses categoricals and smaller numbers while keeping every value, so dashboards read the same data in less memory."""
+    df = make_test_df()
+
+    compact = compact_dtypes(df)
+
+    assert compact["Country"].dtype == "category"
+    assert compact["Age"].dtype == "int8"
+    assert compact["Avg_Daily_Usage_Hours"].dtype == "float32"
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+    assert compact.astype(df.dtypes.to_dict()).equals(df)
+
+    result = DashboardFilterIndex(compact).filter(gender="Male", countries=["Canada", "USA"])
+    assert set(result["Student_ID"]) == {1, 3}
+
+
 def test_summarize_country_metrics_returns_expected_counts_and_means():
     """This test verifies country aggregation correctness so the choropleth uses accurate counts and averages."""
     df = make_test_df()
@@ -90,6 +225,18 @@ def test_summarize_country_metrics_returns_expected_counts_and_means():
     assert round(usa["Sleep_Hours_Per_Night"], 2) == 6.5
 
 
+def test_summarize_country_metrics_keeps_precomputed_iso_codes():
+    """This test verifies that the prep-time iso_alpha column is carried through country aggregation so the map can draw shapes without resolving names per request."""
+    df = make_test_df()
+    df["iso_alpha"] = df["Country"].map({"Canada": "CAN", "USA": "USA"})
+
+    summary = summarize_country_metrics(df).set_index("Country")
+
+    assert summary.loc["Canada", "iso_alpha"] == "CAN"
+    assert pd.isna(summary.loc["India", "iso_alpha"])
+    assert summary.loc["India", "Student_ID"] == 2
+
+
 def test_group_platforms_for_sunburst_groups_small_categories_into_other():
     """This test verifies that low-frequency platforms are collapsed into 'Other' so the sunburst remains readable and stable."""
     df = make_test_df()
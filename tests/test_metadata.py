@@ -0,0 +1,45 @@
+import json
+
+import pandas as pd
+
+from src.metadata import dataset_metadata, read_metadata, sidecar_path, write_metadata
+
+
+def make_students():
+    return pd.DataFrame({
+        "Age": [18, 24, 21, 19],
+        "Gender": ["Female", "Male", "Female", "Female"],
+        "Country": ["India", "USA", "India", "Kosovo"],
+        "iso_alpha": ["IND", "USA", "IND", None],
+        "Addicted_Score": [3, 9, 7, 5],
+    })
+
+
+def test_sidecar_round_trips_ranges_values_and_counts(tmp_path):
+    """This test verifies that the sidecar written next to a parquet file records its row count, numeric ranges and distinct values with counts, and is read back unchanged."""
+    path = tmp_path / "students.parquet"
+    make_students().to_parquet(path)
+
+    written = write_metadata(path)
+    metadata = read_metadata(path)
+
+    assert written == sidecar_path(path) == tmp_path / "students.meta.json"
+    assert metadata["row_count"] == 4
+    assert metadata["ranges"]["Age"] == [18, 24]
+    assert metadata["values"]["Country"] == {"values": ["India", "Kosovo", "USA"], "counts": [2, 1, 1]}
+    assert metadata["values"]["iso_alpha"] == {"values": ["IND", "USA", None], "counts": [2, 1, 1]}
+    assert {k: metadata[k] for k in ("row_count", "ranges", "values")} == json.loads(
+        json.dumps(dataset_metadata(make_students()))
+    )
+
+
+def test_stale_or_missing_sidecar_is_ignored(tmp_path):
+    """This test verifies that a sidecar is ignored once the parquet file it describes is rewritten with different data, and that a missing sidecar reads as None."""
+    path = tmp_path / "students.parquet"
+    assert read_metadata(path) is None
+
+    make_students().to_parquet(path)
+    write_metadata(path)
+    make_students().assign(Age=[18, 25, 21, 19]).to_parquet(path)
+
+    assert read_metadata(path) is None
@@ -0,0 +1,78 @@
+import asyncio
+
+from shiny import render
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from src.metrics import (
+    MetricsRegistry,
+    instrument,
+    instrument_chat_client,
+    instrument_session,
+    metrics_route,
+)
+
+
+def test_registry_records_histograms_and_serves_prometheus_text():
+    """This test verifies that timed calcs and renders are counted into cumulative latency buckets and exposed with payload bytes on the metrics route."""
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    timed = instrument(registry)
+
+    @timed
+    def filtered_df():
+        return [1, 2, 3]
+
+    @timed
+    @render.text
+    def tile_students():
+        return "678"
+
+    assert filtered_df() == [1, 2, 3]
+    assert asyncio.run(tile_students.render()) == "678"
+    registry.observe("querychat", "llm", 2.0)
+    registry.add_payload("tile_students", 5)
+
+    stats = registry.stats()
+    assert stats["latency"][("filtered_df", "calc")]["count"] == 1
+    assert stats["latency"][("tile_students", "render")]["count"] == 1
+
+    body = TestClient(Starlette(routes=[metrics_route(registry)])).get("/metrics").text
+    assert 'dashboard_latency_seconds_bucket{name="querychat",kind="llm",le="1"} 0' in body
+    assert 'dashboard_latency_seconds_bucket{name="querychat",kind="llm",le="+Inf"} 1' in body
+    assert 'dashboard_latency_seconds_count{name="filtered_df",kind="calc"} 1' in body
+    assert 'dashboard_output_payload_bytes_total{output="tile_students"} 5' in body
+
+
+def test_session_and_chat_client_instrumentation():
+    """This test verifies that outgoing output values and widget messages are attributed to their output, and that a streamed LLM reply is timed once it finishes."""
+    registry = MetricsRegistry()
+    registry.widget_outputs["abc123"] = "map_chart"
+    sent = []
+
+    class FakeSession:
+        async def _send_message(self, message):
+            sent.append(message)
+
+    class FakeClient:
+        async def stream_async(self, prompt):
+            async def chunks():
+                yield "SELECT "
+                yield "*"
+            return chunks()
+
+    session, client = FakeSession(), FakeClient()
+    instrument_session(registry, session)
+    instrument_chat_client(registry, client)
+
+    widget_patch = '{"content": {"data": {"x": 1}, "comm_id": "abc123"}, "ident": "comm-abc123", "parent": {}}'
+
+    async def run():
+        await session._send_message({"values": {"tile_students": "340"}})
+        await session._send_message({"custom": {"shinywidgets_comm_msg": widget_patch}})
+        return [chunk async for chunk in await client.stream_async("hi")]
+
+    assert asyncio.run(run()) == ["SELECT ", "*"]
+    assert len(sent) == 2
+    stats = registry.stats()
+    assert stats["payload_bytes"] == {"tile_students": len('"340"'), "map_chart": len(widget_patch)}
+    assert stats["latency"][("querychat", "llm")]["count"] == 1
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.synthetic import (
+    NUMERIC_COLUMNS,
+    SYNTHETIC_SCHEMA,
+    fit_synthetic_model,
+    iter_synthetic,
+    write_synthetic_parquet,
+)
+
+
+def make_real_df():
+    rng = np.random.default_rng(42)
+    rows = 400
+    usage = rng.integers(20, 80, rows) / 10
+    addicted = np.clip(np.round(usage * 1.2 + rng.normal(0, 0.8, rows)), 2, 9).astype(int)
+    return pd.DataFrame(
+        {
+            "Student_ID": np.arange(1, rows + 1),
+            "Age": rng.choice([19, 20, 22], rows),
+            "Gender": rng.choice(["Male", "Female"], rows),
+            "Academic_Level": rng.choice(["Undergraduate", "Graduate"], rows),
+            "Country": rng.choice(["Canada", "India", "Turkey"], rows),
+            "Avg_Daily_Usage_Hours": usage,
+            "Most_Used_Platform": rng.choice(["Instagram", "TikTok", "Twitter"], rows),
+            "Sleep_Hours_Per_Night": np.round(9 - usage * 0.5 + rng.normal(0, 0.3, rows), 1),
+            "Mental_Health_Score": np.clip(10 - addicted, 1, 9),
+            "Relationship_Status": rng.choice(["Single", "In Relationship"], rows),
+            "Conflicts_Over_Social_Media": np.clip(addicted - 4, 0, 5),
+            "Addicted_Score": addicted,
+            "Affects_Academic_Performance": np.where(addicted > 6, "Yes", "No"),
+        }
+    ).assign(iso_alpha=lambda d: d["Country"].map({"Canada": "CAN", "India": "IND"}))
+
+
+def test_generator_is_deterministic_and_streams_chunks(tmp_path):
+    """This test verifies that the same seed produces the same file, chunked writing keeps the schema and row count, and a different seed changes the data."""
+    model = fit_synthetic_model(make_real_df(), calibration_rows=20_000, iterations=3)
+
+    first = write_synthetic_parquet(model, tmp_path / "a.parquet", rows=2_500, seed=7, chunk_rows=1_000)
+    second = write_synthetic_parquet(model, tmp_path / "b.parquet", rows=2_500, seed=7, chunk_rows=1_000)
+    other_seed = pd.concat(t.to_pandas() for t in iter_synthetic(model, 2_500, seed=8, chunk_rows=1_000))
+
+    assert pq.ParquetFile(first).metadata.num_row_groups == 3
+    assert pq.read_schema(first).remove_metadata().equals(SYNTHETIC_SCHEMA)
+    a, b = pd.read_parquet(first), pd.read_parquet(second)
+    pd.testing.assert_frame_equal(a, b)
+    assert a["Student_ID"].tolist() == list(range(1, 2_501))
+    assert not a["Addicted_Score"].equals(other_seed["Addicted_Score"].reset_index(drop=True))
+
+
+def test_generator_preserves_joint_distributions():
+    """This test verifies that synthetic rows only use category combinations and numeric values seen in the real data and keep its rank correlations."""
+    real = make_real_df()
+    model = fit_synthetic_model(real, calibration_rows=20_000, iterations=3)
+    synthetic = next(iter_synthetic(model, 50_000, seed=1)).to_pandas()
+
+    real_pairs = set(zip(real["Age"], real["Academic_Level"]))
+    assert set(zip(synthetic["Age"], synthetic["Academic_Level"])) <= real_pairs
+    assert synthetic.loc[synthetic["Country"] == "Turkey", "iso_alpha"].isna().all()
+    for column in NUMERIC_COLUMNS:
+        assert set(synthetic[column]) <= set(real[column])
+
+    real_corr = real[NUMERIC_COLUMNS].corr(method="spearman")
+    synthetic_corr = synthetic[NUMERIC_COLUMNS].corr(method="spearman")
+    assert (real_corr - synthetic_corr).abs().to_numpy().max() < 0.05